@@ -0,0 +1,5 @@
+# -*- coding: utf-8 -*-
+"""
+公共模块
+爬虫、数据清洗、数据检查及各分析脚本共用的工具代码
+"""
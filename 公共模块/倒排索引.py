@@ -0,0 +1,201 @@
+# -*- coding: utf-8 -*-
+"""
+关键词倒排索引
+关键词 -> 包含该关键词的评论序号（升序int32数组，即posting list），以及该关键词在每条评论中的出现次数。
+各分析脚本的"包含某关键词的评论有多少条、典型样本是哪几条、某配置/颜色下有多少条"
+都可以由posting list的长度、并集（OR）、交集（AND）和前几个序号得到，不必再逐条扫描评论全文；
+"某配置/人群的评论中共提及某关键词多少次"由出现次数按分组求和得到，不必把评论拼接成长字符串再逐词count。
+
+索引用关键词自动机（见 关键词匹配.py）对评论只扫描一遍建立，保存在数据文件旁的"缓存"目录，
+以数据文件内容为键；不同脚本需要的关键词不同，缺少的关键词只对这些关键词补扫一遍后合并写回，
+因此同一份数据的索引由各脚本共用、逐步补全。
+"""
+
+import os
+
+import numpy as np
+import pandas as pd
+
+from 公共模块.关键词匹配 import KeywordMatcher
+from 公共模块.数据加载 import cache_path, file_digest
+
+_EMPTY = np.empty(0, dtype=np.int32)
+
+
+def build_postings(texts, keywords):
+    """扫描评论，返回 ({关键词: 评论序号数组}, {关键词: 各评论中的出现次数数组})
+    缺失的评论不含任何关键词，其余按str(评论)匹配；出现次数为不重叠计数，与 str(评论).count(关键词) 相同
+    """
+    keywords = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+    matcher = KeywordMatcher({'关键词': keywords})
+    review_ids = {keyword: [] for keyword in keywords}
+    review_counts = {keyword: [] for keyword in keywords}
+    for i, text in enumerate(texts):
+        if text is None or text != text:  # None / NaN
+            continue
+        for keyword, count in matcher.count(str(text)).items():
+            review_ids[keyword].append(i)
+            review_counts[keyword].append(count)
+    return ({keyword: np.asarray(ids, dtype=np.int32) for keyword, ids in review_ids.items()},
+            {keyword: np.asarray(counts, dtype=np.int32) for keyword, counts in review_counts.items()})
+
+
+class KeywordIndex:
+    """关键词倒排索引
+
+    用法:
+        index = load_keyword_index(data_file, df['评论内容'], ['发热', '卡顿', '掉电'])
+        index.count('发热')                  # 包含"发热"的评论条数
+        ids = index.any_of(['发热', '卡顿'])  # 包含任一关键词的评论序号（升序）
+        df['评论内容'].iloc[ids[:3]]          # 前3条典型样本
+        index.mask(ids)                      # 转为与评论等长的布尔数组
+        index.group_occurrences(['发热', '卡顿'], df['配置'])  # 各配置的评论中各关键词共出现多少次
+    """
+
+    def __init__(self, size, postings, occurrences):
+        """
+        :param size: 评论条数
+        :param postings: {关键词: 升序int32评论序号数组}
+        :param occurrences: {关键词: 与评论序号一一对应的出现次数数组}
+        """
+        self.size = size
+        self.postings = postings
+        self.occurrences = occurrences
+
+    def __contains__(self, keyword):
+        return keyword in self.postings
+
+    def ids(self, keyword):
+        """包含该关键词的评论序号（升序）"""
+        return self.postings.get(keyword, _EMPTY)
+
+    def count(self, keyword):
+        """包含该关键词的评论条数"""
+        return len(self.ids(keyword))
+
+    def any_of(self, keywords):
+        """包含任一关键词的评论序号（OR，升序）"""
+        lists = [self.ids(keyword) for keyword in keywords]
+        lists = [ids for ids in lists if len(ids)]
+        if not lists:
+            return _EMPTY
+        if len(lists) == 1:
+            return lists[0]
+        return np.unique(np.concatenate(lists))
+
+    def all_of(self, keywords):
+        """同时包含全部关键词的评论序号（AND，升序）"""
+        result = None
+        for keyword in keywords:
+            ids = self.ids(keyword)
+            result = ids if result is None else np.intersect1d(result, ids, assume_unique=True)
+            if not len(result):
+                break
+        return _EMPTY if result is None else result
+
+    def mask(self, ids):
+        """评论序号转为与评论等长的布尔数组"""
+        mask = np.zeros(self.size, dtype=bool)
+        mask[ids] = True
+        return mask
+
+    def total_occurrences(self, keywords, rows=None):
+        """各关键词在评论中共出现多少次，返回Series（关键词 -> 次数）
+        :param rows: 只统计这些评论（与评论等长的布尔数组），默认全部评论
+        """
+        keywords = list(dict.fromkeys(keywords))
+        totals = []
+        for keyword in keywords:
+            counts = self.occurrences.get(keyword, _EMPTY)
+            if rows is not None:
+                counts = counts[np.asarray(rows)[self.ids(keyword)]]
+            totals.append(int(counts.sum()))
+        return pd.Series(totals, index=keywords, dtype=np.int64)
+
+    def group_occurrences(self, keywords, labels):
+        """按评论的分组标签汇总各关键词的出现次数（相当于 出现次数表.groupby(labels).sum()，但只遍历posting list）
+        :param labels: 每条评论的分组（与评论等长，缺失的评论不计入任何分组）
+        :return: DataFrame（行为分组，按标签排序；列为关键词，值为出现次数之和）
+        """
+        keywords = list(dict.fromkeys(keywords))
+        codes, groups = pd.factorize(pd.Series(labels), sort=True)
+        table = {}
+        for keyword in keywords:
+            keyword_codes = codes[self.ids(keyword)]
+            labelled = keyword_codes >= 0
+            counts = self.occurrences.get(keyword, _EMPTY)[labelled]
+            table[keyword] = np.bincount(keyword_codes[labelled], weights=counts, minlength=len(groups)).astype(np.int64)
+        return pd.DataFrame(table, index=groups, columns=keywords)
+
+
+def _read_index(path):
+    with np.load(path, allow_pickle=False) as data:
+        keywords = data['keywords'].tolist()
+        offsets = data['offsets']
+        ids = data['ids']
+        counts = data['counts']
+        size = int(data['size'])
+    bounds = list(zip(keywords, offsets[:-1], offsets[1:]))
+    postings = {keyword: ids[start:end] for keyword, start, end in bounds}
+    occurrences = {keyword: counts[start:end] for keyword, start, end in bounds}
+    return size, postings, occurrences
+
+
+def _write_index(path, size, postings, occurrences):
+    keywords = list(postings)
+    lengths = [len(postings[keyword]) for keyword in keywords]
+    offsets = np.concatenate(([0], np.cumsum(lengths, dtype=np.int64)))
+    ids = np.concatenate([postings[keyword] for keyword in keywords]) if keywords else _EMPTY
+    counts = np.concatenate([occurrences[keyword] for keyword in keywords]) if keywords else _EMPTY
+    tmp_file = path + '.tmp.npz'
+    np.savez(tmp_file, keywords=np.asarray(keywords, dtype=str), offsets=offsets, ids=ids.astype(np.int32),
+             counts=counts.astype(np.int32), size=np.int64(size))
+    os.replace(tmp_file, path)
+
+
+def load_keyword_index(data_path, texts, keywords, use_cache=True):
+    """返回评论的关键词倒排索引，优先读取缓存，缓存中缺少的关键词补扫后写回
+    :param data_path: 评论所在的数据文件（用于定位缓存及判断是否过期）
+    :param texts: 该文件的评论内容Series（整列，序号即评论在该列中的位置）
+    :param keywords: 需要的关键词
+    :param use_cache: 为False时跳过缓存直接扫描
+    :return: KeywordIndex（包含keywords中的全部关键词，缓存里已有的其他关键词也可查询）
+    """
+    if not use_cache:
+        return KeywordIndex(len(texts), *build_postings(texts, keywords))
+
+    digest = file_digest(data_path)
+    sidecar = cache_path(data_path, f'倒排索引_{texts.name}_{digest[:16]}', 'npz')
+    postings, occurrences = {}, {}
+    if os.path.exists(sidecar):
+        try:
+            size, postings, occurrences = _read_index(sidecar)
+            if size != len(texts):
+                postings, occurrences = {}, {}
+        except Exception as exc:
+            print(f"⚠️  倒排索引缓存读取失败，重新建立: {exc}")
+            postings, occurrences = {}, {}
+
+    missing = [keyword for keyword in dict.fromkeys(keywords) if keyword and keyword not in postings]
+    if not missing:
+        return KeywordIndex(len(texts), postings, occurrences)
+
+    new_postings, new_occurrences = build_postings(texts, missing)
+    postings.update(new_postings)
+    occurrences.update(new_occurrences)
+
+    # 清理旧版本缓存，再写入合并后的索引（先写临时文件，避免中断后留下半个文件）
+    cache_dir = os.path.dirname(sidecar)
+    prefix = f"{os.path.splitext(os.path.basename(data_path))[0]}.倒排索引_{texts.name}_"
+    try:
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and os.path.join(cache_dir, name) != sidecar:
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+        _write_index(sidecar, len(texts), postings, occurrences)
+        print(f"💾 已更新倒排索引缓存（新增{len(missing)}个关键词）: {os.path.relpath(sidecar)}")
+    except Exception as exc:
+        print(f"⚠️  倒排索引缓存写入失败: {exc}")
+    return KeywordIndex(len(texts), postings, occurrences)
@@ -0,0 +1,110 @@
+# -*- coding: utf-8 -*-
+"""
+多关键词匹配（Aho-Corasick自动机）
+把多组关键词编译成一个自动机，每条评论只扫描一遍即可找出全部命中及其位置，
+替代"逐模块、逐关键词 keyword in content"的多重循环
+"""
+
+from collections import deque
+
+
+class KeywordMatcher:
+    """Aho-Corasick多关键词匹配器
+
+    用法:
+        matcher = KeywordMatcher({'续航与充电': ['掉电', '耗电快'], '价格负面': ['贵']})
+        hits = matcher.scan('用了两天，掉电有点快，价格也贵')
+        # hits -> {'掉电': 5, '贵': 14}   关键词: 首次出现位置
+        matcher.groups_hit(hits)  # -> ['续航与充电', '价格负面']
+    """
+
+    def __init__(self, keyword_groups):
+        """
+        :param keyword_groups: {分组名: [关键词, ...]}，同一关键词可属于多个分组
+        """
+        # 保留分组内关键词的原始顺序（判断"第一个命中的关键词"时需要）
+        self.groups = {group: list(keywords) for group, keywords in keyword_groups.items()}
+
+        # 构建字典树: goto[状态] = {字符: 下一状态}，output[状态] = 在该状态结束的关键词
+        self._goto = [{}]
+        self._output = [[]]
+        for keywords in self.groups.values():
+            for keyword in keywords:
+                self._add(keyword)
+
+        # BFS构建失败指针，并把失败链上的输出合并到当前状态
+        self._fail = [0] * len(self._goto)
+        queue = deque(self._goto[0].values())
+        while queue:
+            state = queue.popleft()
+            for ch, next_state in self._goto[state].items():
+                queue.append(next_state)
+                fail_state = self._fail[state]
+                while fail_state and ch not in self._goto[fail_state]:
+                    fail_state = self._fail[fail_state]
+                fallback = self._goto[fail_state].get(ch, 0)
+                self._fail[next_state] = fallback if fallback != next_state else 0
+                self._output[next_state] = self._output[next_state] + self._output[self._fail[next_state]]
+
+    def _add(self, keyword):
+        if not keyword:
+            return
+        state = 0
+        for ch in keyword:
+            next_state = self._goto[state].get(ch)
+            if next_state is None:
+                next_state = len(self._goto)
+                self._goto[state][ch] = next_state
+                self._goto.append({})
+                self._output.append([])
+            state = next_state
+        if keyword not in self._output[state]:
+            self._output[state].append(keyword)
+
+    def iter_hits(self, text):
+        """逐个产出命中: (起始位置, 关键词)，包含重叠命中，按结束位置先后排列"""
+        goto, fail, output = self._goto, self._fail, self._output
+        state = 0
+        for i, ch in enumerate(text):
+            while state and ch not in goto[state]:
+                state = fail[state]
+            state = goto[state].get(ch, 0)
+            for keyword in output[state]:
+                yield i - len(keyword) + 1, keyword
+
+    def find_all(self, text):
+        """返回全部命中列表 [(起始位置, 关键词), ...]"""
+        if not isinstance(text, str):
+            return []
+        return list(self.iter_hits(text))
+
+    def scan(self, text):
+        """单遍扫描，返回 {关键词: 首次出现位置}（与 text.find(keyword) 结果一致）"""
+        hits = {}
+        if not isinstance(text, str):
+            return hits
+        for pos, keyword in self.iter_hits(text):
+            # 同一关键词长度固定，最先结束的命中即最先开始的命中
+            if keyword not in hits:
+                hits[keyword] = pos
+        return hits
+
+    def count(self, text):
+        """单遍扫描，返回 {关键词: 出现次数}（不重叠计数，与 text.count(keyword) 结果一致）"""
+        counts = {}
+        if not isinstance(text, str):
+            return counts
+        next_start = {}  # 关键词 -> 下一次命中的最小起始位置（与str.count一样，计数过的命中不再重叠计数）
+        for pos, keyword in self.iter_hits(text):
+            if pos >= next_start.get(keyword, 0):
+                counts[keyword] = counts.get(keyword, 0) + 1
+                next_start[keyword] = pos + len(keyword)
+        return counts
+
+    def group_hit(self, hits, group):
+        """分组内是否有任意关键词命中（等价于 any(kw in text for kw in 分组关键词)）"""
+        return any(keyword in hits for keyword in self.groups[group])
+
+    def groups_hit(self, hits):
+        """返回有命中的分组名列表（按分组定义顺序）"""
+        return [group for group in self.groups if self.group_hit(hits, group)]
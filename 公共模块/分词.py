@@ -0,0 +1,170 @@
+# -*- coding: utf-8 -*-
+"""
+分词
+逐条评论用jieba分词，评论较多时分批交给进程池并行处理，返回与评论一一对应的词列表。
+以spawn方式（Windows）启动的子进程会重新导入主脚本，调用方脚本的分析流程需放在 if __name__ == '__main__' 下。
+jieba按非中文字符切分文本块，逐条分词与把评论用空格拼接后整体分词得到的词相同（只是不含拼接用的空格）。
+
+分词结果缓存在数据文件旁的"缓存"目录（Arrow列表列，词按字典编码存储），
+以数据文件内容和词典（jieba版本 + 自定义词）为键，各分析脚本对同一份数据、同一词典只分词一次；
+不同词典的缓存各自保留，数据更新后只清理同一词典的旧缓存。
+缓存的是未过滤的原始分词结果，停用词等过滤由各脚本读取后自行处理，因此不同停用词表可共用同一份缓存。
+"""
+
+import hashlib
+import multiprocessing
+import os
+import re
+from collections import Counter
+
+import jieba
+import numpy as np
+import pandas as pd
+
+from 公共模块.数据加载 import cache_path, file_digest, feather
+
+# 手机评论的自定义词典（各分析脚本共用，保证分词结果一致、可共用缓存）
+CUSTOM_WORDS = [
+    '性价比', '续航', '拍照', '像素', '电池', '充电', '快充', '运行', '流畅',
+    '外观', '颜值', '屏幕', '音质', '音效', '散热', '发热', '信号', '指纹',
+    '人脸识别', '解锁', '系统', '处理器', '内存', '存储', '卡顿', '死机',
+    '物流', '快递', '包装', '客服', '售后', '活动', '优惠', '划算', '超值'
+]
+
+# 无效词：纯英文字母，或全部由符号组成（两条规则合并为一个预编译正则）
+INVALID_WORD_PATTERN = re.compile(r'[a-zA-Z]+|[\W_]+')
+
+# 评论少于该条数时直接在当前进程分词（启动进程、加载词典的开销比分词本身还大）
+PARALLEL_MIN_REVIEWS = 5000
+
+_tokenizers = {}  # 自定义词(元组) -> 分词器；每个进程中每种词典只加载一次
+
+
+def _get_tokenizer(user_words):
+    """返回加入了自定义词的分词器
+    每种词典使用独立的jieba.Tokenizer，自定义词不会加入jieba的全局词典，
+    因此同一进程中先后使用不同词典分词，结果互不影响（与各自的缓存键一致）
+    """
+    key = tuple(user_words)
+    tokenizer = _tokenizers.get(key)
+    if tokenizer is None:
+        tokenizer = jieba.Tokenizer()
+        tokenizer.initialize()
+        for word in key:
+            tokenizer.add_word(word)
+        _tokenizers[key] = tokenizer
+    return tokenizer
+
+
+def _cut_batch(texts, user_words=()):
+    tokenizer = _get_tokenizer(user_words)
+    return [tokenizer.lcut(text) for text in texts]
+
+
+def segment_reviews(texts, user_words=(), workers=None):
+    """逐条评论分词
+    :param texts: 评论文本列表
+    :param user_words: 自定义词典中的词（只加入本次分词使用的分词器，不影响jieba全局词典）
+    :param workers: 进程数，默认为CPU核数；为1时不使用进程池
+    :return: 词列表的列表，与texts一一对应
+    """
+    texts = list(texts)
+    user_words = tuple(user_words)
+
+    workers = workers or os.cpu_count() or 1
+    if workers <= 1 or len(texts) < PARALLEL_MIN_REVIEWS:
+        return _cut_batch(texts, user_words)
+
+    # 先在主进程加载词典，fork方式启动的子进程可直接复用
+    _get_tokenizer(user_words)
+    batch_size = -(-len(texts) // (workers * 4))
+    batches = [texts[i:i + batch_size] for i in range(0, len(texts), batch_size)]
+    with multiprocessing.Pool(workers) as pool:
+        results = pool.starmap(_cut_batch, [(batch, user_words) for batch in batches])
+    return [tokens for batch in results for tokens in batch]
+
+
+def is_valid_word(word, stopwords):
+    """词是否保留：至少2个字符、不是停用词、不是纯数字、不是纯英文、不是纯符号"""
+    return (len(word) >= 2 and word not in stopwords and not word.isdigit()
+            and INVALID_WORD_PATTERN.fullmatch(word) is None)
+
+
+def filter_word_counts(words, stopwords):
+    """统计词频并过滤无效词
+    先用Counter统计词频，再对去重后的词逐个判断，每个不同的词只判断一次（词表远小于总词数）
+    :param words: 词的序列
+    :param stopwords: 停用词集合
+    :return: 过滤后的词频Counter（词的顺序与首次出现的顺序一致，与直接统计过滤后的词列表结果相同）
+    """
+    return Counter({word: count for word, count in Counter(words).items() if is_valid_word(word, stopwords)})
+
+
+def _dictionary_version(user_words):
+    """词典指纹：jieba版本 + 自定义词"""
+    key = '\n'.join([jieba.__version__] + sorted(user_words))
+    return hashlib.sha1(key.encode('utf-8')).hexdigest()[:8]
+
+
+def _read_tokens(sidecar):
+    column = feather.read_table(sidecar, memory_map=True).column('分词').combine_chunks()
+    offsets = column.offsets.to_numpy()
+    words = np.asarray(column.values.dictionary.to_pylist(), dtype=object)
+    flat = words[column.values.indices.to_numpy()].tolist()
+    return [flat[start:end] for start, end in zip(offsets[:-1], offsets[1:])]
+
+
+def _write_tokens(sidecar, review_tokens):
+    import pyarrow as pa
+
+    lengths = np.fromiter((len(tokens) for tokens in review_tokens), dtype=np.int32, count=len(review_tokens))
+    offsets = pa.array(np.concatenate(([0], np.cumsum(lengths, dtype=np.int32))))
+    flat = pa.array([word for tokens in review_tokens for word in tokens], type=pa.string()).dictionary_encode()
+    table = pa.table({'分词': pa.ListArray.from_arrays(offsets, flat)})
+    tmp_file = sidecar + '.tmp'
+    feather.write_feather(table, tmp_file, compression='uncompressed')
+    os.replace(tmp_file, sidecar)
+
+
+def load_review_tokens(data_path, texts, user_words=CUSTOM_WORDS, use_cache=True):
+    """返回每条评论的分词结果，优先读取缓存
+    :param data_path: 评论所在的数据文件（用于定位缓存及判断是否过期）
+    :param texts: 该文件的评论内容Series（整列，行号即评论编号）
+    :param user_words: 自定义词典
+    :param use_cache: 为False时跳过缓存直接分词
+    :return: Series（索引与texts一致），每个元素为该评论的词列表，缺失的评论为空列表
+    """
+    sidecar = None
+    if use_cache and feather is not None:
+        digest = file_digest(data_path)
+        sidecar = cache_path(data_path, f'分词_{digest[:16]}_{_dictionary_version(user_words)}', 'feather')
+        if os.path.exists(sidecar):
+            try:
+                review_tokens = _read_tokens(sidecar)
+                if len(review_tokens) == len(texts):
+                    return pd.Series(review_tokens, index=texts.index, dtype=object)
+            except Exception as exc:
+                print(f"⚠️  分词缓存读取失败，重新分词: {exc}")
+
+    present = texts.notna().to_numpy()
+    segmented = iter(segment_reviews(texts[present].astype(str), user_words))
+    review_tokens = [next(segmented) if has_text else [] for has_text in present]
+
+    if sidecar is not None:
+        # 清理同一词典下数据已过期的旧缓存（不同词典的缓存各自保留，如词云分析和产品偏好分析各用一份），
+        # 再写入新缓存（先写临时文件，避免中断后留下半个文件）
+        cache_dir = os.path.dirname(sidecar)
+        prefix = f"{os.path.splitext(os.path.basename(data_path))[0]}.分词_"
+        suffix = f"_{_dictionary_version(user_words)}.feather"
+        try:
+            for name in os.listdir(cache_dir):
+                if name.startswith(prefix) and name.endswith(suffix) and os.path.join(cache_dir, name) != sidecar:
+                    try:
+                        os.remove(os.path.join(cache_dir, name))
+                    except OSError:
+                        pass
+            _write_tokens(sidecar, review_tokens)
+            print(f"💾 已生成分词缓存: {os.path.relpath(sidecar)}")
+        except Exception as exc:
+            print(f"⚠️  分词缓存写入失败: {exc}")
+    return pd.Series(review_tokens, index=texts.index, dtype=object)
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+关键词命中矩阵
+评论 × 关键词 的命中矩阵：第i行第j列表示第i条评论是否包含第j个关键词。
+矩阵按位压缩（每条评论占 ceil(关键词数/8) 字节），保存为数据文件旁"缓存"目录中的.npy，以内存映射方式读取。
+
+矩阵由关键词倒排索引（见 倒排索引.py）直接生成，与索引共用同一次评论扫描；每个矩阵只含调用方需要的关键词，
+各脚本的矩阵分别缓存，互不影响；
+各脚本按类别、配置、颜色、人群的计数都由矩阵的列（或若干列的"或"）求和、groupby聚合得到，
+不必每个类别、每个分组各扫描一遍评论。
+"""
+
+import hashlib
+import os
+
+import numpy as np
+import pandas as pd
+
+from 公共模块.倒排索引 import load_keyword_index
+from 公共模块.数据加载 import cache_path, file_digest
+
+
+def _pack(size, postings):
+    """由倒排索引生成按位压缩的命中矩阵（第j个关键词在第 j//8 字节的第 7-j%8 位）"""
+    packed = np.zeros((size, (len(postings) + 7) // 8), dtype=np.uint8)
+    for j, ids in enumerate(postings.values()):
+        packed[ids, j >> 3] |= np.uint8(0x80 >> (j & 7))
+    return packed
+
+
+class HitMatrix:
+    """评论 × 关键词 命中矩阵
+
+    用法:
+        matrix = load_hit_matrix(data_file, df['评论内容'], ['发热', '卡顿', '掉电'])
+        matrix.column('发热')                     # 每条评论是否包含"发热"（布尔数组）
+        matrix.any_of(['发热', '卡顿'])           # 是否包含任一关键词
+        hits = matrix.group_hits({'性能': ['发热', '卡顿'], '续航': ['掉电']}, index=df.index)
+        hits.groupby(df['配置']).sum()            # 各配置中命中各类别的评论数
+    """
+
+    def __init__(self, keywords, packed):
+        """
+        :param keywords: 各列对应的关键词
+        :param packed: 按位压缩的矩阵，形状为 (评论条数, ceil(关键词数/8))
+        """
+        self.keywords = list(keywords)
+        self.packed = packed
+        self._columns = {keyword: j for j, keyword in enumerate(self.keywords)}
+
+    @property
+    def size(self):
+        return self.packed.shape[0]
+
+    def column(self, keyword):
+        """每条评论是否包含该关键词（布尔数组；矩阵中没有的关键词视为都不包含）"""
+        j = self._columns.get(keyword)
+        if j is None:
+            return np.zeros(self.size, dtype=bool)
+        return (self.packed[:, j >> 3] & np.uint8(0x80 >> (j & 7))) != 0
+
+    def count(self, keyword):
+        """包含该关键词的评论条数"""
+        return int(self.column(keyword).sum())
+
+    def any_of(self, keywords):
+        """每条评论是否包含任一关键词（布尔数组）"""
+        result = np.zeros(self.size, dtype=bool)
+        for keyword in dict.fromkeys(keywords):
+            result |= self.column(keyword)
+        return result
+
+    def keyword_hits(self, keywords, index=None):
+        """各关键词的命中表：DataFrame（行为评论，列为关键词，值为是否包含）"""
+        keywords = list(dict.fromkeys(keywords))
+        return pd.DataFrame({keyword: self.column(keyword) for keyword in keywords}, index=index, columns=keywords)
+
+    def group_hits(self, keyword_groups, index=None):
+        """各关键词分组的命中表：DataFrame（行为评论，列为分组名，值为是否包含该组任一关键词）
+        :param keyword_groups: {分组名: [关键词, ...]}
+        :param index: 结果的行索引（通常传入 df.index）
+        """
+        return pd.DataFrame({group: self.any_of(keywords) for group, keywords in keyword_groups.items()},
+                            index=index, columns=list(keyword_groups))
+
+
+def load_hit_matrix(data_path, texts, keywords, use_cache=True):
+    """返回评论的关键词命中矩阵，优先读取缓存（内存映射）
+    矩阵只包含调用方需要的关键词，以数据文件内容和这些关键词为键缓存：
+    缓存有效时直接映射，不读取倒排索引；其他脚本向索引补充关键词也不会使本矩阵失效
+    :param data_path: 评论所在的数据文件（用于定位缓存及判断是否过期）
+    :param texts: 该文件的评论内容Series（整列）
+    :param keywords: 需要的关键词（即矩阵的列，重复的只保留一列）
+    :param use_cache: 为False时跳过缓存直接扫描
+    :return: HitMatrix
+    """
+    columns = list(dict.fromkeys(keyword for keyword in keywords if keyword))
+    if not use_cache:
+        index = load_keyword_index(data_path, texts, columns, use_cache)
+        return HitMatrix(columns, _pack(index.size, {keyword: index.ids(keyword) for keyword in columns}))
+
+    # 以数据文件内容和关键词列表（即矩阵的列）为键
+    digest = file_digest(data_path)[:16]
+    columns_key = hashlib.sha1('\n'.join(columns).encode('utf-8')).hexdigest()[:8]
+    sidecar = cache_path(data_path, f'命中矩阵_{texts.name}_{digest}_{columns_key}', 'npy')
+    shape = (len(texts), (len(columns) + 7) // 8)
+    if os.path.exists(sidecar):
+        try:
+            packed = np.load(sidecar, mmap_mode='r')
+            if packed.shape == shape:
+                return HitMatrix(columns, packed)
+        except Exception as exc:
+            print(f"⚠️  命中矩阵缓存读取失败，重新生成: {exc}")
+
+    index = load_keyword_index(data_path, texts, columns, use_cache)
+    packed = _pack(index.size, {keyword: index.ids(keyword) for keyword in columns})
+
+    # 清理数据已过期的旧缓存（当前数据下其他关键词组合的矩阵属于其他脚本，予以保留），
+    # 再写入新缓存（先写临时文件，避免中断后留下半个文件）；无法删除的文件（如在Windows上仍被映射）留到以后再清理
+    cache_dir = os.path.dirname(sidecar)
+    prefix = f"{os.path.splitext(os.path.basename(data_path))[0]}.命中矩阵_{texts.name}_"
+    try:
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith('.npy') and not name.startswith(f'{prefix}{digest}_'):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+        tmp_file = sidecar + '.tmp.npy'
+        np.save(tmp_file, packed)
+        os.replace(tmp_file, sidecar)
+        print(f"💾 已生成命中矩阵缓存: {os.path.relpath(sidecar)}")
+        packed = np.load(sidecar, mmap_mode='r')
+    except Exception as exc:
+        print(f"⚠️  命中矩阵缓存写入失败: {exc}")
+    return HitMatrix(columns, packed)
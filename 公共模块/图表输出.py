@@ -0,0 +1,165 @@
+# -*- coding: utf-8 -*-
+"""
+图表输出
+各分析脚本保存图表时共用的渲染配置，由环境变量 RENDER_PROFILE 选择：
+    publication  出版模式（默认）：300 dpi、bbox_inches='tight'、词云按原尺寸生成，用于交付
+    preview      预览模式：100 dpi、不计算紧凑边界、词云画布缩小一半、使用Agg后端，用于反复调试分析时快速出图
+两种模式的图表内容和布局相同（都先调用 tight_layout），只是分辨率和词云的细节不同。
+
+后台渲染：多核机器上 save_figure 把图表（序列化后的Figure，词云只传词频和参数）提交给Agg渲染进程池后立即返回，
+脚本继续后续的统计分析，生成报告后再用 wait_figures 等待所有图表保存完成。
+渲染进程数由环境变量 RENDER_WORKERS 指定，默认为 CPU核数-1（最多3个）；只有1个CPU或设为0时在当前进程直接保存。
+以spawn方式（Windows）启动的渲染进程会重新导入主脚本，调用方脚本的分析流程需放在 if __name__ == '__main__' 下。
+每张图的渲染耗时（词云生成 + 保存）按图表名累计，脚本结束前用 print_render_times 输出。
+
+用法: RENDER_PROFILE=preview python 词云图分析.py    （Windows: set RENDER_PROFILE=preview）
+"""
+
+import os
+import pickle
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import matplotlib
+import numpy as np
+
+PROFILES = {
+    'publication': {'name': '出版', 'dpi': 300, 'bbox_inches': 'tight', 'wordcloud_scale': 1.0, 'backend': None},
+    'preview': {'name': '预览', 'dpi': 100, 'bbox_inches': None, 'wordcloud_scale': 0.5, 'backend': 'Agg'},
+}
+DEFAULT_PROFILE = 'publication'
+MAX_RENDER_WORKERS = 3
+
+_render_times = {}  # 图表名 -> 累计渲染秒数（按首次出现的顺序）
+_wordclouds = {}    # id(Figure) -> 待生成的词云 [(子图序号, 图像序号, WordCloud参数, 词频)]
+_pending = []       # 后台渲染中的图表 [(图表名, Future)]
+_executor = None
+
+
+def render_profile():
+    """返回当前的渲染配置（环境变量 RENDER_PROFILE，未设置或无法识别时为出版模式）"""
+    key = os.environ.get('RENDER_PROFILE', DEFAULT_PROFILE).strip().lower()
+    return PROFILES.get(key, PROFILES[DEFAULT_PROFILE])
+
+
+def render_workers():
+    """后台渲染进程数（环境变量 RENDER_WORKERS，默认为 CPU核数-1，最多3个；0表示不使用后台进程）"""
+    value = os.environ.get('RENDER_WORKERS', '').strip()
+    if value.isdigit():
+        return int(value)
+    return max(0, min(MAX_RENDER_WORKERS, (os.cpu_count() or 1) - 1))
+
+
+def setup_backend():
+    """按渲染配置切换matplotlib后端（各脚本只保存图片、不显示窗口，预览模式直接使用Agg）"""
+    backend = render_profile()['backend']
+    if backend and matplotlib.get_backend().lower() != backend.lower():
+        matplotlib.use(backend)
+
+
+def wordcloud_size(width, height):
+    """按渲染配置缩放词云画布尺寸，返回 (width, height)"""
+    scale = render_profile()['wordcloud_scale']
+    return max(1, int(width * scale)), max(1, int(height * scale))
+
+
+def wordcloud_image(ax, frequencies, interpolation='bilinear', **options):
+    """在ax中放置词云图
+    词云在保存图表时才生成（后台渲染时在渲染进程中生成）。这里先放一张同尺寸的空白占位图，
+    因此之后调用 tight_layout 得到的布局与直接放入词云图时相同。
+    :param frequencies: 词频字典
+    :param options: WordCloud的参数（width、height、font_path等）
+    :return: 占位图的AxesImage
+    """
+    scale = options.get('scale', 1)
+    width, height = int(options.get('width', 400) * scale), int(options.get('height', 200) * scale)
+    image = ax.imshow(np.zeros((height, width, 3), dtype=np.uint8), interpolation=interpolation)
+    fig = ax.figure
+    _wordclouds.setdefault(id(fig), []).append(
+        (fig.axes.index(ax), ax.images.index(image), dict(options), dict(frequencies)))
+    return image
+
+
+def _render(fig, path, dpi, bbox_inches, wordclouds):
+    """生成词云并保存图表，返回耗时（秒）"""
+    import matplotlib.pyplot as plt
+
+    start = time.perf_counter()
+    if wordclouds:
+        from wordcloud import WordCloud
+
+        for axes_index, image_index, options, frequencies in wordclouds:
+            cloud = WordCloud(**options).generate_from_frequencies(frequencies)
+            fig.axes[axes_index].images[image_index].set_data(cloud.to_array())
+    fig.savefig(path, dpi=dpi, bbox_inches=bbox_inches)
+    plt.close(fig)
+    return time.perf_counter() - start
+
+
+def _render_pickled(data, path, dpi, bbox_inches, wordclouds):
+    return _render(pickle.loads(data), path, dpi, bbox_inches, wordclouds)
+
+
+def _init_worker(rc):
+    matplotlib.use('Agg')
+    matplotlib.rcParams.update(rc)
+
+
+def _submit(*args):
+    global _executor
+    if _executor is None:
+        # 渲染进程使用与主进程相同的字体等设置
+        rc = {key: value for key, value in matplotlib.rcParams.items()
+              if not key.startswith('backend') and value != matplotlib.rcParamsDefault.get(key)}
+        _executor = ProcessPoolExecutor(render_workers(), initializer=_init_worker, initargs=(rc,))
+    return _executor.submit(_render_pickled, *args)
+
+
+def save_figure(path, label, fig=None):
+    """按渲染配置保存图表并关闭
+    有后台渲染进程时提交渲染后立即返回，文件在 wait_figures 返回后才保证已写入；否则直接保存
+    :param path: 输出文件
+    :param label: 图表名（用于输出耗时）
+    :param fig: 要保存的Figure，默认为当前图表
+    """
+    import matplotlib.pyplot as plt
+
+    profile = render_profile()
+    fig = fig or plt.gcf()
+    wordclouds = _wordclouds.pop(id(fig), [])
+    if render_workers() > 0:
+        try:
+            data = pickle.dumps(fig)
+        except Exception as exc:
+            print(f"⚠️  图表无法提交后台渲染，直接保存: {exc}")
+        else:
+            _pending.append((label, _submit(data, path, profile['dpi'], profile['bbox_inches'], wordclouds)))
+            plt.close(fig)
+            return
+    _render_times[label] = _render_times.get(label, 0.0) + _render(
+        fig, path, profile['dpi'], profile['bbox_inches'], wordclouds)
+
+
+def wait_figures():
+    """等待后台渲染的图表全部保存完成（渲染出错时在此抛出异常），并关闭渲染进程"""
+    global _executor
+    while _pending:
+        label, future = _pending.pop(0)
+        _render_times[label] = _render_times.get(label, 0.0) + future.result()
+    if _executor is not None:
+        _executor.shutdown()
+        _executor = None
+
+
+def print_render_times():
+    """输出各图表的渲染耗时（后台渲染的图表为渲染进程中的耗时）"""
+    wait_figures()
+    if not _render_times:
+        return
+    profile = render_profile()
+    workers = render_workers()
+    mode = f"，{workers}个后台渲染进程" if workers else ""
+    print(f"\n▶ 图表渲染耗时（{profile['name']}模式，{profile['dpi']} dpi{mode}）:")
+    for label, seconds in _render_times.items():
+        print(f"  {label:<12} {seconds:>7.2f} 秒")
+    print(f"  {'合计':<12} {sum(_render_times.values()):>7.2f} 秒")
@@ -0,0 +1,77 @@
+# -*- coding: utf-8 -*-
+"""
+属性情感
+统计评论中各属性（续航、拍照……）的提及次数及其正面、负面、中性倾向：
+对每条评论、每个属性，取按关键词顺序第一个出现的关键词，以它首次出现的位置截取上下文窗口
+（前10个字符到后20个字符），窗口中只含正面词记为正面、只含负面词记为负面，其余为中性。
+
+哪些评论提及了哪个关键词由关键词倒排索引（见 倒排索引.py）得到，不必逐行遍历评论；
+每条提及只查找一次关键词位置，全部属性的窗口收集到一起后，用一个"或"正则批量判断是否包含正面词、负面词。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+
+def first_keyword_windows(texts, index, keywords, before=10, after=20):
+    """截取每条提及的评论中，按keywords顺序第一个出现的关键词的上下文窗口
+    :param texts: 评论内容（与建立index时相同的整列Series或数组，序号即评论在该列中的位置）
+    :param index: 包含keywords的关键词倒排索引
+    :param keywords: 关键词（顺序即优先顺序）
+    :return: (评论序号数组, 窗口文本列表)；内容为"nan"的评论视为缺失，不计入
+    """
+    owner = np.full(index.size, -1, dtype=np.int32)  # 评论 -> 第一个出现的关键词在keywords中的序号
+    for j, keyword in enumerate(keywords):
+        ids = index.ids(keyword)
+        owner[ids[owner[ids] < 0]] = j
+
+    values = np.asarray(texts, dtype=object)
+    review_ids, windows = [], []
+    for i in np.flatnonzero(owner >= 0).tolist():
+        text = str(values[i])
+        if text == 'nan':
+            continue
+        pos = text.find(keywords[owner[i]])
+        review_ids.append(i)
+        windows.append(text[max(0, pos - before):pos + after])
+    return np.asarray(review_ids, dtype=np.int64), windows
+
+
+def contains_any(texts, words):
+    """批量判断每段文本是否包含任一词，返回布尔数组"""
+    words = [word for word in dict.fromkeys(words) if word]
+    if not len(texts) or not words:
+        return np.zeros(len(texts), dtype=bool)
+    pattern = '|'.join(re.escape(word) for word in words)
+    return pd.Series(texts, dtype=str).str.contains(pattern, regex=True).to_numpy(dtype=bool)
+
+
+def aspect_sentiment(texts, index, aspect_keywords, positive_words, negative_words, before=10, after=20):
+    """统计各属性的提及次数及正面、负面、中性提及次数
+    :param texts: 评论内容Series（与建立index时相同的整列）
+    :param index: 包含全部属性关键词的关键词倒排索引
+    :param aspect_keywords: {属性: [关键词, ...]}
+    :param positive_words: 正面词
+    :param negative_words: 负面词
+    :param before: 窗口从关键词位置向前的字符数
+    :param after: 窗口从关键词位置向后的字符数
+    :return: DataFrame（索引为属性，列为 提及、正面、负面、中性）
+    """
+    aspects = list(aspect_keywords)
+    values = np.asarray(texts, dtype=object)  # 各属性共用，只转换一次
+    aspect_codes, windows = [], []
+    for code, keywords in enumerate(aspect_keywords.values()):
+        review_ids, aspect_windows = first_keyword_windows(values, index, keywords, before, after)
+        aspect_codes.append(np.full(len(review_ids), code, dtype=np.int64))
+        windows.extend(aspect_windows)
+    aspect_codes = np.concatenate(aspect_codes) if aspect_codes else np.empty(0, dtype=np.int64)
+
+    is_positive = contains_any(windows, positive_words)
+    is_negative = contains_any(windows, negative_words)
+    mentions = np.bincount(aspect_codes, minlength=len(aspects))
+    positive = np.bincount(aspect_codes[is_positive & ~is_negative], minlength=len(aspects))
+    negative = np.bincount(aspect_codes[is_negative & ~is_positive], minlength=len(aspects))
+    return pd.DataFrame({'提及': mentions, '正面': positive, '负面': negative,
+                         '中性': mentions - positive - negative}, index=aspects)
@@ -0,0 +1,94 @@
+# -*- coding: utf-8 -*-
+"""
+数据加载（列存缓存）
+第一次读取Excel某个Sheet时，把结果另存为Feather列存文件（放在数据文件旁的"缓存"目录），
+之后再读取同一Sheet直接内存映射该文件，不再用openpyxl解析整个xlsx。
+缓存以源文件的 mtime/大小 + 内容SHA1 为键，源文件内容变化后自动重建。
+"""
+
+import hashlib
+import json
+import os
+
+import pandas as pd
+
+try:
+    import pyarrow.feather as feather
+except ImportError:  # 未安装pyarrow时退化为直接读取Excel
+    feather = None
+
+CACHE_DIR_NAME = '缓存'
+
+
+def cache_path(data_path, tag, ext):
+    """返回数据文件对应的缓存文件路径: <数据目录>/缓存/<数据文件名>.<tag>.<ext>"""
+    cache_dir = os.path.join(os.path.dirname(os.path.abspath(data_path)), CACHE_DIR_NAME)
+    os.makedirs(cache_dir, exist_ok=True)
+    base = os.path.splitext(os.path.basename(data_path))[0]
+    return os.path.join(cache_dir, f'{base}.{tag}.{ext}')
+
+
+def file_digest(data_path):
+    """返回文件内容的SHA1
+    mtime和大小与上次记录一致时直接复用记录值，不再重新读取整个文件
+    """
+    stat = os.stat(data_path)
+    meta_file = cache_path(data_path, '指纹', 'json')
+    try:
+        with open(meta_file, 'r', encoding='utf-8') as f:
+            meta = json.load(f)
+        if meta['mtime'] == stat.st_mtime and meta['size'] == stat.st_size:
+            return meta['sha1']
+    except (OSError, ValueError, KeyError):
+        pass
+
+    sha1 = hashlib.sha1()
+    with open(data_path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            sha1.update(chunk)
+    digest = sha1.hexdigest()
+
+    with open(meta_file, 'w', encoding='utf-8') as f:
+        json.dump({'mtime': stat.st_mtime, 'size': stat.st_size, 'sha1': digest}, f)
+    return digest
+
+
+def load_sheet(xlsx_path, sheet_name='商品评论', use_cache=True):
+    """读取Excel中的一个Sheet，优先使用列存缓存
+    :param xlsx_path: Excel文件路径
+    :param sheet_name: Sheet名称
+    :param use_cache: 为False时跳过缓存，直接解析Excel
+    :return: DataFrame
+    """
+    if not use_cache or feather is None:
+        return pd.read_excel(xlsx_path, sheet_name=sheet_name)
+
+    digest = file_digest(xlsx_path)
+    sidecar = cache_path(xlsx_path, f'{sheet_name}_{digest[:16]}', 'feather')
+
+    if os.path.exists(sidecar):
+        try:
+            return feather.read_table(sidecar, memory_map=True).to_pandas()
+        except Exception as exc:
+            print(f"⚠️  列存缓存读取失败，重新生成: {exc}")
+
+    df = pd.read_excel(xlsx_path, sheet_name=sheet_name)
+
+    # 清理同一Sheet的旧版本缓存，再写入新缓存（先写临时文件，避免中断后留下半个文件）；
+    # 无法删除的文件（如在Windows上被其他进程打开）留到以后再清理
+    cache_dir = os.path.dirname(sidecar)
+    prefix = f"{os.path.splitext(os.path.basename(xlsx_path))[0]}.{sheet_name}_"
+    try:
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith('.feather'):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+        tmp_file = sidecar + '.tmp'
+        feather.write_feather(df, tmp_file, compression='uncompressed')
+        os.replace(tmp_file, sidecar)
+        print(f"💾 已生成列存缓存: {os.path.relpath(sidecar)}")
+    except Exception as exc:
+        print(f"⚠️  列存缓存写入失败，本次直接使用Excel数据: {exc}")
+    return df
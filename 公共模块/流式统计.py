@@ -0,0 +1,221 @@
+# -*- coding: utf-8 -*-
+"""
+流式统计
+用openpyxl只读模式按块读取Excel的Sheet，逐块累计数据质量检查需要的各项统计：
+缺失值、空白值、重复行（行哈希）、数据类型、评论长度分布、商家回复/"更多"标记/换行符、购买记录完整性。
+除重复行检查保留每行一个8字节哈希外，内存占用只与块大小有关，与Sheet行数无关；
+近似模式下重复行改用布隆过滤器估计，并用HyperLogLog估计各列唯一值个数，内存完全固定。
+"""
+
+import re
+from collections import Counter
+
+import numpy as np
+import openpyxl
+from pandas.api.types import is_bool_dtype, is_numeric_dtype, is_string_dtype
+
+from 公共模块.近似计数 import BloomFilter, HyperLogLog, hash_values
+
+SELLER_REPLY_PATTERN = re.compile('商家回复|店家回复|卖家回复')
+NEWLINE_PATTERN = re.compile('\n|\r')
+
+
+def open_workbook(xlsx_path):
+    """以只读模式打开Excel（不把整个工作簿载入内存）"""
+    return openpyxl.load_workbook(xlsx_path, read_only=True, data_only=True)
+
+
+def iter_sheet_chunks(workbook, sheet_name, chunk_size=20000):
+    """逐块读取Sheet
+    :return: 生成器，依次产出 (列名列表, 行列表)，每行是与列名等长的元组；
+             与pd.read_excel一致，第一行为列名，末尾的空行不计入
+    """
+    ws = workbook[sheet_name]
+    ws.reset_dimensions()  # 部分程序生成的文件记录的范围不准确，按实际内容读取
+    rows = ws.iter_rows(values_only=True)
+    header = next(rows, None)
+    if header is None:
+        return
+    columns = [name if name is not None else f'Unnamed: {i}' for i, name in enumerate(header)]
+    width = len(columns)
+
+    chunk = []
+    empty_rows = 0  # 连续空行，遇到后续非空行时才计入
+    for row in rows:
+        row = tuple(row[:width]) + (None,) * (width - len(row))
+        if all(value is None for value in row):
+            empty_rows += 1
+            continue
+        if empty_rows:
+            chunk.extend([(None,) * width] * empty_rows)
+            empty_rows = 0
+        chunk.append(row)
+        if len(chunk) >= chunk_size:
+            yield columns, chunk
+            chunk = []
+    if chunk:
+        yield columns, chunk
+
+
+def _merge_dtype(current, dtype):
+    """合并两个数据块推断出的列类型（规则与pandas读取整列时一致：整数+浮点为浮点，类型不同为object）"""
+    if current is None or current == dtype:
+        return dtype
+    if is_numeric_dtype(current) and is_numeric_dtype(dtype) and not is_bool_dtype(current) and not is_bool_dtype(dtype):
+        return np.result_type(current, dtype)
+    return np.dtype(object)
+
+
+class SheetStats:
+    """逐块累计一个Sheet的通用质量统计"""
+
+    def __init__(self, columns, preview_rows=3, approximate=False, capacity=10_000_000):
+        """
+        :param columns: 列名列表
+        :param preview_rows: 保留用于预览的行数
+        :param approximate: 为True时重复行用布隆过滤器估计，并用HyperLogLog估计各列唯一值个数
+        :param capacity: 近似模式下布隆过滤器的设计容量（行数），超出后误判率上升
+        """
+        self.columns = list(columns)
+        self.rows = 0
+        self.preview = []                       # 前几行（用于数据预览）
+        self.missing = Counter()                # 列名 -> 缺失值个数
+        self.blank = Counter()                  # 列名 -> 空白字符串个数
+        self._preview_rows = preview_rows
+        self._dtypes = dict.fromkeys(self.columns)
+        self._has_null = dict.fromkeys(self.columns, False)
+        self._row_hashes = []
+        self.approximate = approximate
+        if approximate:
+            self._bloom = BloomFilter(capacity)
+            self._bloom_duplicates = 0
+            self._distinct = {col: HyperLogLog() for col in self.columns}
+
+    def update(self, df, rows):
+        """累计一个数据块
+        :param df: 该块的DataFrame
+        :param rows: 该块的原始行（元组），用于计算行哈希
+        """
+        if len(self.preview) < self._preview_rows:
+            self.preview.extend(df.head(self._preview_rows - len(self.preview)).to_dict('records'))
+        self.rows += len(df)
+
+        nulls = df.isnull().sum()
+        for col in self.columns:
+            if nulls[col]:
+                self.missing[col] += int(nulls[col])
+                self._has_null[col] = True
+            if nulls[col] < len(df):  # 整块为空的列不参与类型推断
+                self._dtypes[col] = _merge_dtype(self._dtypes[col], df[col].dtype)
+            if is_string_dtype(df[col].dtype):
+                blank = (df[col].astype(str).str.strip() == '').sum()
+                if blank:
+                    self.blank[col] += int(blank)
+
+        if self.approximate:
+            self._bloom_duplicates += int(self._bloom.add_new(hash_values(rows)).sum())
+            for col, values in zip(self.columns, zip(*rows)):
+                self._distinct[col].update(hash_values(value for value in values if value is not None))
+        else:
+            self._row_hashes.append(np.fromiter((hash(row) for row in rows), dtype=np.int64, count=len(rows)))
+
+    def dtypes(self):
+        """返回各列的数据类型（与pd.read_excel读取整个Sheet的推断结果一致）"""
+        result = {}
+        for col in self.columns:
+            dtype = self._dtypes[col]
+            if dtype is None:  # 整列为空
+                dtype = np.dtype('float64')
+            elif self._has_null[col] and dtype.kind in 'iu':
+                dtype = np.dtype('float64')
+            elif self._has_null[col] and dtype.kind == 'b':
+                dtype = np.dtype(object)
+            result[col] = dtype
+        return result
+
+    def duplicates(self):
+        """完全重复的行数（第一次出现的不计）；近似模式下为布隆过滤器的估计值（可能略多）"""
+        if self.approximate:
+            return self._bloom_duplicates
+        if not self._row_hashes:
+            return 0
+        hashes = np.concatenate(self._row_hashes)
+        return int(len(hashes) - len(np.unique(hashes)))
+
+    def duplicate_error_rate(self):
+        """近似模式下重复行估计的误判率（把新行误判为重复的概率）"""
+        return self._bloom.current_error_rate() if self.approximate else 0.0
+
+    def distinct_counts(self):
+        """近似模式下各列唯一值个数的估计（不含缺失值）"""
+        return {col: sketch.count() for col, sketch in self._distinct.items()} if self.approximate else {}
+
+
+class ReviewStats:
+    """逐块累计商品评论Sheet的评论内容质量统计"""
+
+    def __init__(self, short_examples=10, seller_examples=3, purchase_examples=5):
+        self.rows = 0
+        self.length_counts = np.zeros(0, dtype=np.int64)  # 评论长度 -> 条数
+        self.short_count = 0
+        self.short_examples = []                          # (行号, 行)
+        self.seller_reply_count = 0
+        self.seller_reply_examples = []
+        self.more_tag_count = 0
+        self.newline_count = 0
+        self.has_purchase_column = False
+        self.purchase_count = 0
+        self.missing_purchase_examples = []
+        self._limits = (short_examples, seller_examples, purchase_examples)
+
+    @staticmethod
+    def _examples(examples, limit, selected):
+        if len(examples) < limit:
+            examples.extend(zip(selected.index[:limit - len(examples)],
+                                selected.head(limit - len(examples)).to_dict('records')))
+
+    def update(self, df):
+        """累计一个数据块（df的索引为该块各行在整个Sheet中的行号）"""
+        short_limit, seller_limit, purchase_limit = self._limits
+        self.rows += len(df)
+        if '评论内容' in df.columns:
+            content = df['评论内容'].astype(str)
+            lengths = content.str.len()
+            valid = lengths.dropna().astype(np.int64).to_numpy()
+            counts = np.bincount(valid)
+            if len(counts) > len(self.length_counts):
+                counts[:len(self.length_counts)] += self.length_counts
+                self.length_counts = counts
+            else:
+                self.length_counts[:len(counts)] += counts
+
+            short = df[lengths < 5].assign(评论长度=lengths[lengths < 5].astype(int))
+            self.short_count += len(short)
+            self._examples(self.short_examples, short_limit, short)
+
+            seller = df[content.str.contains(SELLER_REPLY_PATTERN, na=False)]
+            self.seller_reply_count += len(seller)
+            self._examples(self.seller_reply_examples, seller_limit, seller)
+
+            self.more_tag_count += int(content.str.contains('更多', na=False, regex=False).sum())
+            self.newline_count += int(content.str.contains(NEWLINE_PATTERN, na=False).sum())
+
+        if '购买记录' in df.columns:
+            self.has_purchase_column = True
+            has_purchase = df['购买记录'].notna() & (df['购买记录'].astype(str).str.strip() != '')
+            self.purchase_count += int(has_purchase.sum())
+            self._examples(self.missing_purchase_examples, purchase_limit, df[~has_purchase])
+
+    def length_summary(self):
+        """返回评论长度的 (平均, 最短, 最长, 中位数)，由长度分布计算"""
+        total = self.length_counts.sum()
+        if total == 0:
+            return float('nan'), float('nan'), float('nan'), float('nan')
+        lengths = np.arange(len(self.length_counts))
+        nonzero = np.flatnonzero(self.length_counts)
+        cumulative = np.cumsum(self.length_counts)
+        # 中位数：总数为偶数时取中间两个的平均
+        lower = np.searchsorted(cumulative, (total - 1) // 2 + 1)
+        upper = np.searchsorted(cumulative, total // 2 + 1)
+        mean = (lengths * self.length_counts).sum() / total
+        return mean, int(nonzero[0]), int(nonzero[-1]), (lower + upper) / 2
@@ -0,0 +1,109 @@
+# -*- coding: utf-8 -*-
+"""
+购买记录解析
+用一个组合正则通过 Series.str.extract 一次性解析"购买记录"列（如"2025年9月20日 · 星空蓝 / 12GB+256GB"），
+得到带类型的字段：
+    购买时间  datetime64（日期无效时为NaT）
+    内存/存储 Int16（单位GB，未识别时为<NA>）
+    配置      字符串，如"12GB+256GB"
+    颜色      category（按COLORS顺序取第一个出现的颜色，未识别时为NaN）
+解析结果以Feather格式缓存在数据文件旁的"缓存"目录，各分析脚本直接复用。
+"""
+
+import hashlib
+import os
+import re
+
+import pandas as pd
+
+from 公共模块.数据加载 import cache_path, file_digest, feather
+
+# 常见颜色关键词（按优先级排序：同一条记录包含多个颜色时取排在前面的）
+COLORS = ['曜夜黑', '星光白', '远航蓝', '幻夜黑', '星空蓝', '流光紫',
+          '黑色', '白色', '蓝色', '紫色', '绿色', '红色', '粉色']
+
+# 各字段都用从开头起的可选前瞻匹配，每个字段取最左边的一处匹配（与 re.search 一致），互不影响
+_COLOR_GROUPS = ''.join(f'(?=.*?(?P<c{i}>{re.escape(color)}))?' for i, color in enumerate(COLORS))
+PURCHASE_PATTERN = re.compile(
+    r'^(?=.*?(?P<年>\d{4})年(?P<月>\d{1,2})月(?P<日>\d{1,2})日)?'
+    r'(?=.*?(?P<内存>\d+)GB[\+\s]*(?P<存储>\d+)GB)?'
+    + _COLOR_GROUPS,
+    re.DOTALL,
+)
+# 正则或颜色表变化时缓存自动失效
+_PARSER_VERSION = hashlib.sha1(PURCHASE_PATTERN.pattern.encode('utf-8')).hexdigest()[:8]
+
+
+def parse_purchase_records(records):
+    """解析购买记录
+    :param records: 购买记录Series
+    :return: DataFrame（索引与records一致），列为 购买时间、内存、存储、配置、颜色
+    """
+    text = records.astype('string')
+    parts = text.str.extract(PURCHASE_PATTERN)
+
+    date_parts = parts[['年', '月', '日']].astype('float64')
+    date_parts.columns = ['year', 'month', 'day']
+    purchase_time = pd.to_datetime(date_parts, errors='coerce')
+
+    ram = pd.to_numeric(parts['内存'], errors='coerce')
+    storage = pd.to_numeric(parts['存储'], errors='coerce')
+    has_config = ram.notna() & storage.notna()
+    config = (ram.astype('Int64').astype('string') + 'GB+'
+              + storage.astype('Int64').astype('string') + 'GB').where(has_config)
+
+    # 颜色：取优先级最高（列序最靠前）的命中
+    color_columns = parts[[f'c{i}' for i in range(len(COLORS))]]
+    color = color_columns.bfill(axis=1).iloc[:, 0]
+
+    result = pd.DataFrame({
+        '购买时间': purchase_time,
+        '内存': ram.where(ram <= 32767).astype('Int16'),
+        '存储': storage.where(storage <= 32767).astype('Int16'),
+        '配置': config.astype(object).where(has_config, None),
+        '颜色': pd.Categorical(color.astype(object).where(color.notna(), None), categories=COLORS),
+    }, index=records.index)
+    return result
+
+
+def load_purchase_features(data_path, records, use_cache=True):
+    """返回购买记录解析结果，优先读取缓存
+    :param data_path: 购买记录所在的数据文件（用于定位缓存及判断是否过期）
+    :param records: 该文件的购买记录Series
+    :param use_cache: 为False时跳过缓存直接解析
+    """
+    if not use_cache or feather is None:
+        return parse_purchase_records(records)
+
+    digest = file_digest(data_path)
+    sidecar = cache_path(data_path, f'购买记录解析_{digest[:16]}_{_PARSER_VERSION}', 'feather')
+
+    if os.path.exists(sidecar):
+        try:
+            cached = feather.read_feather(sidecar)
+            if len(cached) == len(records):
+                cached.index = records.index
+                return cached
+        except Exception as exc:
+            print(f"⚠️  购买记录解析缓存读取失败，重新解析: {exc}")
+
+    result = parse_purchase_records(records)
+
+    # 清理旧版本缓存，再写入新缓存（先写临时文件，避免中断后留下半个文件）；
+    # 无法删除的文件（如在Windows上被其他进程打开）留到以后再清理
+    cache_dir = os.path.dirname(sidecar)
+    prefix = f"{os.path.splitext(os.path.basename(data_path))[0]}.购买记录解析_"
+    try:
+        for name in os.listdir(cache_dir):
+            if name.startswith(prefix) and name.endswith('.feather'):
+                try:
+                    os.remove(os.path.join(cache_dir, name))
+                except OSError:
+                    pass
+        tmp_file = sidecar + '.tmp'
+        feather.write_feather(result.reset_index(drop=True), tmp_file, compression='uncompressed')
+        os.replace(tmp_file, sidecar)
+        print(f"💾 已生成购买记录解析缓存: {os.path.relpath(sidecar)}")
+    except Exception as exc:
+        print(f"⚠️  购买记录解析缓存写入失败: {exc}")
+    return result
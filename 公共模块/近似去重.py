@@ -0,0 +1,147 @@
+# -*- coding: utf-8 -*-
+"""
+近似去重（MinHash + LSH）
+找出模板化、仅有少量字词不同的近似重复评论：
+    1. 去掉空白和标点后取字符n-gram作为shingle，按块流式计算每条评论的MinHash签名（内存只与块大小有关）
+    2. 签名分为 b段×r行 做LSH分桶，只有至少一段完全相同的评论才成为候选对，整体复杂度近似线性
+    3. 用签名估计候选对的Jaccard相似度，不低于阈值的合并为同一个簇（并查集），簇内最早出现的评论为代表
+每条评论只保留16位的签名（b-bit MinHash），100万条评论、64个哈希约占128MB。
+"""
+
+import re
+
+import numpy as np
+import pandas as pd
+
+# 计算shingle前去掉的字符：空白、标点、表情等非文字字符
+_NORMALIZE_PATTERN = re.compile(r'[\W_]+')
+_GRAM_MULTIPLIER = np.uint64(0x100000001B3)
+_BAND_MULTIPLIER = np.uint64(0x9E3779B97F4A7C15)
+
+
+def optimal_lsh_params(threshold, num_perm):
+    """按给定的Jaccard阈值选择LSH的段数b和每段行数r（b*r<=num_perm），使误判和漏判的概率之和最小
+    :return: (b, r)
+    """
+    s = np.linspace(0, 1, 1001)
+    ds = s[1] - s[0]
+    below, above = s <= threshold, s >= threshold
+    best, best_error = (1, num_perm), np.inf
+    for b in range(1, num_perm + 1):
+        for r in range(1, num_perm // b + 1):
+            probability = 1 - (1 - s ** r) ** b  # 相似度为s的两条评论成为候选对的概率
+            false_positive = probability[below].sum() * ds
+            false_negative = (1 - probability[above]).sum() * ds
+            if false_positive + false_negative < best_error:
+                best, best_error = (b, r), false_positive + false_negative
+    return best
+
+
+def _chunk_signatures(texts, a, c, shingle_size):
+    """计算一块评论的MinHash签名，返回 (len(texts), num_perm) 的uint32数组"""
+    texts = [_NORMALIZE_PATTERN.sub('', text.lower()) or text for text in texts]
+    # 评论之间用 shingle_size-1 个空字符分隔，拼成一个码点数组一次计算所有n-gram
+    padding = '\0' * (shingle_size - 1)
+    codes = np.frombuffer((padding.join(texts) + padding).encode('utf-32-le'), dtype=np.uint32).astype(np.uint64)
+    gram_count = len(codes) - shingle_size + 1
+    grams = codes[:gram_count].copy()
+    for j in range(1, shingle_size):
+        grams = grams * _GRAM_MULTIPLIER + codes[j:j + gram_count]
+
+    # 每条评论的n-gram起止位置（短于shingle_size的评论取一个补齐的n-gram）
+    lengths = np.fromiter((len(text) for text in texts), dtype=np.int64, count=len(texts))
+    text_starts = np.concatenate(([0], np.cumsum(lengths + shingle_size - 1)[:-1]))
+    counts = np.maximum(lengths - shingle_size + 1, 1)
+    gram_starts = np.concatenate(([0], np.cumsum(counts)[:-1]))
+    positions = np.arange(counts.sum()) + np.repeat(text_starts - gram_starts, counts)
+    grams = grams[positions]
+
+    # 乘法-移位哈希族 h(x) = ((a*x + c) mod 2^64) >> 32，每次计算一部分哈希函数以控制内存
+    signatures = np.empty((len(texts), len(a)), dtype=np.uint32)
+    step = 8
+    for k in range(0, len(a), step):
+        hashed = (a[k:k + step, None] * grams[None, :] + c[k:k + step, None]) >> np.uint64(32)
+        signatures[:, k:k + step] = np.minimum.reduceat(hashed, gram_starts, axis=1).T
+    return signatures
+
+
+def _connected_components(size, left, right):
+    """并查集：返回每个节点所在连通分量的最小节点编号"""
+    parent = np.arange(size)
+    while True:
+        smaller = np.minimum(parent[left], parent[right])
+        updated = parent.copy()
+        np.minimum.at(updated, left, smaller)
+        np.minimum.at(updated, right, smaller)
+        # 路径压缩，直到每个节点都直接指向根
+        while True:
+            jumped = updated[updated]
+            if np.array_equal(jumped, updated):
+                break
+            updated = jumped
+        if np.array_equal(updated, parent):
+            return parent
+        parent = updated
+
+
+def find_near_duplicates(texts, threshold=0.8, num_perm=64, shingle_size=3, chunk_size=10000, seed=42):
+    """查找近似重复的评论
+    :param texts: 评论文本序列
+    :param threshold: Jaccard相似度阈值，估计相似度不低于该值的评论视为近似重复
+    :param num_perm: MinHash哈希函数个数
+    :param shingle_size: 字符n-gram的长度（1~3）
+    :param chunk_size: 每块计算签名的评论条数
+    :param seed: 哈希函数的随机种子
+    :return: (labels, info)，labels[i]为第i条评论所在簇的代表（簇内最早出现的评论序号，未重复时为i）；
+             info为参数说明 {'num_perm', 'bands', 'rows', 'shingle_size', 'candidates', 'pairs'}
+    """
+    texts = [str(text) for text in texts]
+    size = len(texts)
+    bands, rows = optimal_lsh_params(threshold, num_perm)
+    rng = np.random.default_rng(seed)
+    a = rng.integers(1, 2 ** 63, size=num_perm, dtype=np.uint64) | np.uint64(1)
+    c = rng.integers(0, 2 ** 63, size=num_perm, dtype=np.uint64)
+
+    # 按块计算签名：保留16位签名用于估计相似度，各段的桶号用于LSH
+    signatures = np.empty((size, num_perm), dtype=np.uint16)
+    band_keys = np.empty((bands, size), dtype=np.uint64)
+    for start in range(0, size, chunk_size):
+        chunk = _chunk_signatures(texts[start:start + chunk_size], a, c, shingle_size)
+        end = start + len(chunk)
+        signatures[start:end] = chunk & 0xFFFF
+        for band in range(bands):
+            key = np.zeros(len(chunk), dtype=np.uint64)
+            for value in chunk[:, band * rows:(band + 1) * rows].T:
+                key = (key ^ value.astype(np.uint64)) * _BAND_MULTIPLIER
+            band_keys[band, start:end] = key
+
+    # LSH：同一段桶号相同的评论与桶内最早的评论组成候选对（每个桶只产生 桶大小-1 个候选对）
+    candidates = []
+    for key in band_keys:
+        order = np.argsort(key, kind='stable')
+        sorted_key = key[order]
+        is_first = np.concatenate(([True], sorted_key[1:] != sorted_key[:-1]))
+        first_of_bucket = order[np.flatnonzero(is_first)[np.cumsum(is_first) - 1]]
+        candidates.append(first_of_bucket[~is_first] * size + order[~is_first])
+    del band_keys
+    pairs = np.unique(np.concatenate(candidates)) if candidates else np.empty(0, dtype=np.int64)
+    left, right = pairs // size, pairs % size
+
+    # 用签名估计候选对的相似度（分批比较以控制内存）
+    similar = np.empty(len(pairs), dtype=bool)
+    batch = 200000
+    for start in range(0, len(pairs), batch):
+        matched = signatures[left[start:start + batch]] == signatures[right[start:start + batch]]
+        similar[start:start + batch] = matched.mean(axis=1) >= threshold
+    left, right = left[similar], right[similar]
+
+    labels = _connected_components(size, left, right)
+    info = {'num_perm': num_perm, 'bands': bands, 'rows': rows, 'shingle_size': shingle_size,
+            'candidates': len(pairs), 'pairs': len(left)}
+    return labels, info
+
+
+def cluster_sizes(labels):
+    """返回各近似重复簇的大小（只含2条及以上的簇），索引为代表评论序号，按大小降序"""
+    sizes = pd.Series(labels).value_counts()
+    return sizes[sizes > 1]
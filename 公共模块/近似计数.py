@@ -0,0 +1,99 @@
+# -*- coding: utf-8 -*-
+"""
+近似计数
+数据量很大时用固定大小的概率数据结构代替精确计数：
+    HyperLogLog  估计一列的唯一值个数（默认2^14个寄存器，16KB，标准误差约0.8%）
+    BloomFilter  判断一行是否出现过，用于估计重复行数（只会多算、不会漏算，误判率由容量和位数决定）
+输入都是64位整数哈希（见 hash_values），按数组批量更新。
+"""
+
+import math
+
+import numpy as np
+
+_MASK64 = 0xFFFFFFFFFFFFFFFF
+
+
+def hash_values(values):
+    """计算一组Python值的64位哈希（uint64数组）
+    先取Python的hash（与相等比较一致，如 5 与 5.0 的哈希相同），再用splitmix64打散各位
+    """
+    h = np.fromiter((hash(value) & _MASK64 for value in values), dtype=np.uint64)
+    h = h + np.uint64(0x9E3779B97F4A7C15)
+    h = (h ^ (h >> np.uint64(30))) * np.uint64(0xBF58476D1CE4E5B9)
+    h = (h ^ (h >> np.uint64(27))) * np.uint64(0x94D049BB133111EB)
+    return h ^ (h >> np.uint64(31))
+
+
+class HyperLogLog:
+    """HyperLogLog基数估计"""
+
+    def __init__(self, precision=14):
+        self.precision = precision
+        self.registers = np.zeros(1 << precision, dtype=np.uint8)
+
+    def update(self, hashes):
+        """加入一批64位哈希"""
+        if len(hashes) == 0:
+            return
+        p = self.precision
+        index = (hashes >> np.uint64(64 - p)).astype(np.int64)
+        # 剩余的 64-p 位中第一个1出现的位置（剩余位数不超过53，转为float64是精确的）
+        rest = (hashes & np.uint64((1 << (64 - p)) - 1)).astype(np.float64)
+        rank = (64 - p + 1) - np.frexp(rest)[1]
+        np.maximum.at(self.registers, index, rank.astype(np.uint8))
+
+    def count(self):
+        """返回唯一值个数的估计"""
+        m = len(self.registers)
+        alpha = 0.7213 / (1 + 1.079 / m)
+        estimate = alpha * m * m / np.ldexp(1.0, -self.registers.astype(np.int64)).sum()
+        zeros = int((self.registers == 0).sum())
+        if estimate <= 2.5 * m and zeros:  # 基数较小时用线性计数修正
+            estimate = m * math.log(m / zeros)
+        return int(round(estimate))
+
+
+class BloomFilter:
+    """布隆过滤器"""
+
+    def __init__(self, capacity, error_rate=0.001):
+        """
+        :param capacity: 预计加入的元素个数
+        :param error_rate: 加入capacity个元素后的误判率
+        """
+        self.bits = max(8, int(-capacity * math.log(error_rate) / math.log(2) ** 2))
+        self.hash_count = max(1, round(self.bits / capacity * math.log(2)))
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.added = 0
+        self._array = np.zeros((self.bits + 7) // 8, dtype=np.uint8)
+
+    def _positions(self, hashes):
+        # 双重哈希：第i个位置 = h1 + i*h2
+        h1 = hashes & np.uint64(0xFFFFFFFF)
+        h2 = (hashes >> np.uint64(32)) | np.uint64(1)
+        steps = np.arange(self.hash_count, dtype=np.uint64)
+        return ((h1[:, None] + steps[None, :] * h2[:, None]) % np.uint64(self.bits)).astype(np.int64)
+
+    def add_new(self, hashes):
+        """加入一批哈希，返回布尔数组表示每个哈希加入前是否已经存在（批内重复也视为已存在）"""
+        seen = np.ones(len(hashes), dtype=bool)
+        if len(hashes) == 0:
+            return seen
+        unique, first = np.unique(hashes, return_index=True)
+        positions = self._positions(unique)
+        present = ((self._array[positions >> 3] >> (positions & 7).astype(np.uint8)) & 1).all(axis=1)
+        np.bitwise_or.at(self._array, positions.ravel() >> 3,
+                         (np.uint8(1) << (positions.ravel() & 7).astype(np.uint8)))
+        seen[first] = present
+        self.added += int((~present).sum())
+        return seen
+
+    def current_error_rate(self):
+        """按当前已加入的元素个数估计的误判率"""
+        return (1 - math.exp(-self.hash_count * self.added / self.bits)) ** self.hash_count
+
+    @property
+    def nbytes(self):
+        return self._array.nbytes
@@ -0,0 +1,82 @@
+# -*- coding: utf-8 -*-
+"""
+分词过滤基准
+对比词云图分析中两种过滤分词结果的方法：
+    逐词正则  对每个词依次判断长度、停用词、纯数字，并各调用一次 re.match 判断纯英文/纯符号（原实现）
+    词表过滤  先用Counter统计词频，再对去重后的词用预编译正则判断一次（公共模块/分词.py 的 filter_word_counts）
+两种方法得到的词频必须完全相同（包括同频词的先后顺序），否则报错退出。
+
+用法: python 分词过滤基准.py [评论条数] [重复次数]     # 默认 100000 条、3 次
+"""
+
+import os
+import re
+import sys
+import time
+from collections import Counter
+
+import jieba
+
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from 公共模块.分词 import CUSTOM_WORDS, filter_word_counts, segment_reviews
+from 生成测试数据 import generate_reviews
+
+STOPWORDS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '数据分析', '总体评论分析', 'stopwords.txt')
+
+
+def regex_filter(words, stopwords):
+    """原实现：逐词判断，每个词调用两次 re.match"""
+    filtered_words = []
+    for word in words:
+        if (len(word) >= 2 and
+            word not in stopwords and
+            not word.isdigit() and
+            not re.match(r'^[a-zA-Z]+$', word) and
+            not re.match(r'^[\W_]+$', word)):
+            filtered_words.append(word)
+    return Counter(filtered_words)
+
+
+def load_stopwords():
+    stopwords = set()
+    if os.path.exists(STOPWORDS_FILE):
+        with open(STOPWORDS_FILE, 'r', encoding='utf-8') as f:
+            stopwords.update(line.strip() for line in f if line.strip())
+    return stopwords
+
+
+def best_time(func, repeat):
+    """运行repeat次，返回 (最短耗时, 结果)"""
+    best, result = float('inf'), None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func()
+        best = min(best, time.perf_counter() - start)
+    return best, result
+
+
+if __name__ == '__main__':
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    repeat = int(sys.argv[2]) if len(sys.argv) > 2 else 3
+    jieba.setLogLevel(jieba.logging.INFO)
+
+    print(f"▶ 生成并分词 {count:,} 条评论...")
+    _, review_rows = generate_reviews(count)
+    review_tokens = segment_reviews([row[-1] for row in review_rows if row[-1]], CUSTOM_WORDS)
+    words = [word for tokens in review_tokens for word in tokens]
+    stopwords = load_stopwords()
+    print(f"  词数: {len(words):,}，不同的词: {len(set(words)):,}，停用词: {len(stopwords):,}")
+
+    old_time, old_counts = best_time(lambda: regex_filter(words, stopwords), repeat)
+    new_time, new_counts = best_time(lambda: filter_word_counts(words, stopwords), repeat)
+
+    if list(old_counts.items()) != list(new_counts.items()) or old_counts.most_common() != new_counts.most_common():
+        print("❌ 两种方法的词频结果不一致")
+        exit(1)
+
+    print(f"\n{'方法':<10} {'耗时(秒)':>10} {'词/秒':>14}")
+    print("-" * 38)
+    for name, seconds in (('逐词正则', old_time), ('词表过滤', new_time)):
+        print(f"{name:<10} {seconds:>10.3f} {len(words)/seconds:>14,.0f}")
+    print(f"\n✅ 结果一致（有效词 {sum(new_counts.values()):,} 个，去重后 {len(new_counts):,} 个），"
+          f"加速 {old_time/new_time:.1f} 倍")
@@ -0,0 +1,193 @@
+# -*- coding: utf-8 -*-
+"""
+基准测试
+用合成数据（见 生成测试数据.py）在不同数据规模下依次运行数据清洗、数据检查和各分析脚本，
+记录每个脚本的耗时、峰值内存和吞吐量，并生成基准测试结果报告。
+
+每个规模使用独立的工作目录（默认 性能测试/工作目录/<条数>/），目录结构：
+    清洗/  原始数据 → 运行清洗代码.py
+    检查/  原始数据 → 运行检查.py
+    分析/  清洗后数据 + stopwords.txt → 运行各分析脚本
+各脚本在独立子进程中运行（matplotlib使用Agg后端），输出保存为同目录下的 <脚本名>.log。
+--repeat 大于1时重复运行，第2次起可观察列存缓存、解析缓存等生效后的耗时。
+--render-profile preview 以预览模式出图（低分辨率，见 公共模块/图表输出.py），用于观察图表渲染之外的耗时。
+
+用法:
+    python 基准测试.py                      # 默认 1万、10万 条
+    python 基准测试.py 10000 100000 1000000
+    python 基准测试.py 100000 --only 数据清洗 用户痛点分析 --repeat 2
+    python 基准测试.py 100000 --render-profile preview
+"""
+
+import argparse
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime
+
+from 生成测试数据 import DEFAULT_FILENAME, write_workbook
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+DEFAULT_WORKDIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), '工作目录')
+DEFAULT_SIZES = [10000, 100000]
+
+# (名称, 脚本路径, 运行目录)
+STAGES = [
+    ('数据清洗', '数据清洗/清洗代码.py', '清洗'),
+    ('数据检查', '数据检查/检查.py', '检查'),
+    ('用户痛点分析', '数据分析/用户痛点分析/用户痛点分析.py', '分析'),
+    ('购买行为分析', '数据分析/购买行为分析/购买行为分析.py', '分析'),
+    ('用户画像分析', '数据分析/用户画像分析/用户画像代码.py', '分析'),
+    ('词云图分析', '数据分析/总体评论分析/词云图分析.py', '分析'),
+    ('产品偏好挖掘', '数据分析/产品偏好挖掘/产品偏好挖掘分析.py', '分析'),
+]
+
+# 子进程中运行脚本并记录耗时和峰值内存（结果写入JSON文件）
+_RUNNER = r'''
+import json, runpy, sys, time
+script, result_file = sys.argv[1], sys.argv[2]
+sys.argv = [script]
+status = 0
+start = time.perf_counter()
+try:
+    runpy.run_path(script, run_name='__main__')
+except SystemExit as exc:
+    status = exc.code if isinstance(exc.code, int) else (0 if exc.code is None else 1)
+except BaseException:
+    import traceback
+    traceback.print_exc()
+    status = 1
+seconds = time.perf_counter() - start
+peak = None
+try:
+    import resource
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * (1 if sys.platform == 'darwin' else 1024)
+except ImportError:
+    try:
+        import psutil
+        peak = psutil.Process().memory_info().peak_wset
+    except Exception:
+        pass
+sys.stdout = sys.__stdout__
+with open(result_file, 'w', encoding='utf-8') as f:
+    json.dump({'status': status, 'seconds': seconds, 'peak_bytes': peak}, f)
+'''
+
+
+def run_script(script, cwd, log_file, render_profile=None):
+    """在cwd中运行脚本，返回 {'status', 'seconds', 'peak_bytes', 'wall'}"""
+    fd, result_file = tempfile.mkstemp(suffix='.json')
+    os.close(fd)
+    env = dict(os.environ, MPLBACKEND='Agg', PYTHONIOENCODING='utf-8')
+    if render_profile:
+        env['RENDER_PROFILE'] = render_profile
+    started = time.perf_counter()
+    with open(log_file, 'w', encoding='utf-8') as log:
+        proc = subprocess.run([sys.executable, '-c', _RUNNER, script, result_file],
+                              cwd=cwd, env=env, stdout=log, stderr=subprocess.STDOUT)
+    wall = time.perf_counter() - started
+    try:
+        with open(result_file, 'r', encoding='utf-8') as f:
+            result = json.load(f)
+    except (OSError, ValueError):
+        result = {'status': proc.returncode or 1, 'seconds': wall, 'peak_bytes': None}
+    finally:
+        os.remove(result_file)
+    result['wall'] = wall
+    return result
+
+
+def prepare_workspace(workdir, size, seed):
+    """生成数据并建立 清洗/检查/分析 三个运行目录，返回原始数据文件路径"""
+    os.makedirs(workdir, exist_ok=True)
+    raw_file = os.path.join(workdir, DEFAULT_FILENAME)
+    if not os.path.exists(raw_file):
+        print(f"  生成 {size:,} 条合成评论...")
+        started = time.perf_counter()
+        write_workbook(raw_file, size, seed)
+        print(f"  ✓ 生成完成（{time.perf_counter() - started:.1f}秒，{os.path.getsize(raw_file)/1024/1024:.1f} MB）")
+    for stage_dir in ('清洗', '检查', '分析'):
+        os.makedirs(os.path.join(workdir, stage_dir), exist_ok=True)
+    shutil.copy2(raw_file, os.path.join(workdir, '清洗', DEFAULT_FILENAME))
+    shutil.copy2(raw_file, os.path.join(workdir, '检查', DEFAULT_FILENAME))
+    shutil.copy2(os.path.join(PROJECT_ROOT, '数据分析', '总体评论分析', 'stopwords.txt'),
+                 os.path.join(workdir, '分析', 'stopwords.txt'))
+    return raw_file
+
+
+def stage_analysis_input(workdir, raw_file):
+    """把清洗结果放入分析目录；未运行清洗或清洗失败时直接使用原始数据"""
+    cleaned_name = DEFAULT_FILENAME.replace('.xlsx', '_已清洗.xlsx')
+    cleaned_file = os.path.join(workdir, '清洗', cleaned_name)
+    target = os.path.join(workdir, '分析', cleaned_name)
+    if os.path.exists(cleaned_file):
+        shutil.copy2(cleaned_file, target)
+    elif not os.path.exists(target):
+        print("  ⚠️ 没有清洗结果，分析脚本直接使用未清洗的合成数据")
+        shutil.copy2(raw_file, target)
+
+
+def format_mb(peak_bytes):
+    return f"{peak_bytes/1024/1024:.0f}" if peak_bytes else "-"
+
+
+def main():
+    parser = argparse.ArgumentParser(description='用合成数据测试清洗、检查和各分析脚本的耗时与内存')
+    parser.add_argument('sizes', nargs='*', type=int, default=DEFAULT_SIZES, help='评论条数，可指定多个')
+    parser.add_argument('--only', nargs='+', choices=[name for name, _, _ in STAGES], help='只运行指定的脚本')
+    parser.add_argument('--repeat', type=int, default=1, help='每个脚本重复运行的次数')
+    parser.add_argument('--workdir', default=DEFAULT_WORKDIR, help='工作目录')
+    parser.add_argument('--seed', type=int, default=0, help='生成数据的随机种子')
+    parser.add_argument('--render-profile', choices=['publication', 'preview'],
+                        help='各分析脚本的图表渲染模式（默认沿用环境变量 RENDER_PROFILE）')
+    args = parser.parse_args()
+
+    stages = [stage for stage in STAGES if not args.only or stage[0] in args.only]
+    results = []
+
+    print("="*80)
+    print("基准测试".center(80))
+    print("="*80)
+    for size in args.sizes:
+        print(f"\n▶ 数据规模: {size:,} 条")
+        workdir = os.path.join(args.workdir, str(size))
+        raw_file = prepare_workspace(workdir, size, args.seed)
+
+        for name, script, stage_dir in stages:
+            if stage_dir == '分析':
+                stage_analysis_input(workdir, raw_file)
+            for run in range(1, args.repeat + 1):
+                log_file = os.path.join(workdir, stage_dir, f'{os.path.splitext(os.path.basename(script))[0]}.log')
+                result = run_script(os.path.join(PROJECT_ROOT, script), os.path.join(workdir, stage_dir), log_file,
+                                    args.render_profile)
+                result.update(size=size, name=name, run=run, log=log_file)
+                results.append(result)
+                status = "✓" if result['status'] == 0 else f"✗ 失败，见 {os.path.relpath(log_file)}"
+                print(f"  {name:10s} 第{run}次 | {result['seconds']:8.2f}秒 | 峰值内存 {format_mb(result['peak_bytes']):>6s} MB"
+                      f" | {size / result['seconds']:10,.0f} 条/秒 | {status}")
+
+    # 生成报告
+    report_file = f'基准测试结果_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
+    with open(report_file, 'w', encoding='utf-8') as f:
+        f.write("="*80 + "\n")
+        f.write("基准测试结果".center(80) + "\n")
+        f.write("="*80 + "\n\n")
+        f.write(f"测试时间: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}\n")
+        f.write(f"Python: {sys.version.split()[0]}  平台: {sys.platform}\n")
+        f.write(f"数据规模: {', '.join(f'{size:,}' for size in args.sizes)} 条  重复次数: {args.repeat}"
+                f"  渲染模式: {args.render_profile or os.environ.get('RENDER_PROFILE', 'publication')}\n\n")
+        f.write(f"{'规模':>10s}  {'脚本':10s}  {'次数':>4s}  {'耗时(秒)':>9s}  {'峰值内存(MB)':>12s}  {'吞吐(条/秒)':>12s}  状态\n")
+        f.write("-"*80 + "\n")
+        for r in results:
+            f.write(f"{r['size']:>10,}  {r['name']:10s}  {r['run']:>4d}  {r['seconds']:>9.2f}  "
+                    f"{format_mb(r['peak_bytes']):>12s}  {r['size'] / r['seconds']:>12,.0f}  "
+                    f"{'成功' if r['status'] == 0 else '失败'}\n")
+    print(f"\n💾 基准测试结果已保存: {report_file}")
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,151 @@
+# -*- coding: utf-8 -*-
+"""
+生成测试数据
+按爬虫输出的格式（"商品列表" + "商品评论"两个Sheet）生成指定条数的合成评论数据，
+用于在1万/10万/100万条规模下测试清洗、检查及各分析脚本的耗时和内存。
+
+评论由属性好评、痛点描述、用户群体、价格/颜色/配置相关的句子随机拼接，
+并按一定比例混入商家回复、"更多"标记、换行、重复评论、过短评论和空白评论（爬取失败时的空单元格），
+使清洗、检查和各项分析的每个步骤都有数据可处理。
+
+用法: python 生成测试数据.py 100000 [输出目录]
+"""
+
+import os
+import sys
+from datetime import date, timedelta
+
+import numpy as np
+import openpyxl as op
+
+# 文件名与样例数据一致（产品偏好挖掘分析.py 读取固定的文件名）
+DEFAULT_FILENAME = '指定商品_20250930-1555_FromTB.xlsx'
+
+PRODUCT_HEADER = ['Num', 'title', 'Price', 'Deal', 'Location', 'Shop', 'IsPostFree', 'Title_URL',
+                  'Shop_URL', 'Img_URL']
+REVIEW_HEADER = ['商品序号', '商品标题', '用户名', '购买记录', '评论内容']
+
+POSITIVE_SENTENCES = [
+    '运行很流畅，玩游戏不卡', '续航很顶，一天一充完全够用', '性价比很高，国补之后很划算',
+    '拍照清晰，夜景效果很好', '外观漂亮，手感很好，很轻薄', '屏幕显示细腻，看视频很舒服',
+    '充电速度快，半小时就能充满', '信号稳定，5G网速很快', '物流很快，包装完好',
+    '客服态度好，有问必答', '系统很干净，用起来很顺手', '电池耐用，待机时间长',
+]
+NEGATIVE_SENTENCES = [
+    '玩游戏发热严重，有点烫手', '电池掉电快，续航一般', '偶尔卡顿，系统广告太多',
+    '前置拍照模糊，美颜太假', '机身偏重，拿久了手累', '信号不好，地下室经常断网',
+    '价格有点贵，刚买就降价了', '颜色和图片不一样，有点色差', '充电慢，充电器发烫',
+    '屏幕亮度低，太阳底下看不清', '有bug，更新失败了两次', '做工一般，边框有划痕',
+]
+GROUP_SENTENCES = [
+    '买给爸妈用的，老人家说字体够大', '给孩子买的，学生党上课用够了', '打游戏用的，王者荣耀能开满帧',
+    '上班族办公用，通勤路上看视频', '喜欢拍照，拍风景效果不错', '和同学开黑吃鸡很稳',
+]
+CONFIG_SENTENCES = [
+    '纠结了很久不知道选哪个配置', '12+256够用了，没必要上512', '512的存储放照片很放心',
+    '不知道256和512差别大不大',
+]
+FILLER_SENTENCES = ['总体满意', '推荐购买', '还会回购', '好评', '值得入手', '五星好评']
+SELLER_REPLIES = ['商家回复：感谢您的支持，祝您生活愉快', '店家回复：亲，有问题随时联系客服哦',
+                  '卖家回复：感谢亲的认可，期待再次光临']
+SHORT_REVIEWS = ['好', '不错', '可以']
+
+COLORS = ['星光白', '曜夜黑', '远航蓝', '幻夜黑', '星空蓝', '流光紫']
+COLOR_WEIGHTS = [0.40, 0.35, 0.10, 0.06, 0.05, 0.04]
+CONFIGS = ['8GB+256GB', '12GB+256GB', '12GB+512GB', '16GB+512GB']
+CONFIG_WEIGHTS = [0.08, 0.62, 0.18, 0.12]
+
+
+def _pick(rng, pool, size, p=None):
+    return np.asarray(pool, dtype=object)[rng.choice(len(pool), size=size, p=p)]
+
+
+def generate_reviews(n, seed=0, products=None):
+    """生成n条评论
+    :param n: 评论条数
+    :param seed: 随机种子（相同种子生成相同数据）
+    :param products: 商品数量，默认每2000条评论一个商品
+    :return: (商品列表行, 评论行) 两个列表，列顺序与爬虫输出一致
+    """
+    rng = np.random.default_rng(seed)
+    products = products or max(1, n // 2000)
+
+    # 商品列表
+    product_rows = []
+    for num in range(1, products + 1):
+        product_rows.append([num, f'vivo iQOO Z9 Turbo长续航版 测试商品{num}', float(rng.integers(1500, 2500)),
+                             int(rng.integers(100, 100000)), '广东 东莞', f'测试店铺{num % 7 + 1}', '包邮',
+                             f'//item.taobao.com/item.htm?id={700000000 + num}', '', ''])
+
+    # 评论内容：1~3句属性评价 + 可选的痛点/群体/配置句 + 可选的结束语
+    first = _pick(rng, POSITIVE_SENTENCES, n)
+    second = np.where(rng.random(n) < 0.6, _pick(rng, POSITIVE_SENTENCES, n), '')
+    negative = np.where(rng.random(n) < 0.25, _pick(rng, NEGATIVE_SENTENCES, n), '')
+    group = np.where(rng.random(n) < 0.3, _pick(rng, GROUP_SENTENCES, n), '')
+    config = np.where(rng.random(n) < 0.08, _pick(rng, CONFIG_SENTENCES, n), '')
+    filler = np.where(rng.random(n) < 0.5, _pick(rng, FILLER_SENTENCES, n), '')
+    # 使用天数和入手价格使句子组合更分散，百万条规模下重复率也接近真实评论
+    days = rng.integers(1, 91, size=n)
+    prices = rng.integers(1500, 2500, size=n)
+    usage = [f'用了{d}天' if keep else '' for d, keep in zip(days, rng.random(n) < 0.8)]
+    price = [f'{p}元入手' if keep else '' for p, keep in zip(prices, rng.random(n) < 0.5)]
+    contents = ['，'.join(part for part in parts if part) + '。'
+                for parts in zip(usage, first, second, negative, group, config, price, filler)]
+
+    # 清洗需要处理的噪声：商家回复、"更多"标记、换行、过短评论（其中约十分之一为空白评论）、重复评论
+    noise = rng.random((5, n))
+    replies = _pick(rng, SELLER_REPLIES, n)
+    shorts = _pick(rng, SHORT_REVIEWS, n)
+    for i in range(n):
+        if noise[0, i] < 0.05:
+            contents[i] += replies[i]
+        if noise[1, i] < 0.10:
+            contents[i] += '更多'
+        if noise[2, i] < 0.10:
+            contents[i] = contents[i].replace('，', '\n', 1)
+        if noise[3, i] < 0.001:
+            contents[i] = None
+        elif noise[3, i] < 0.01:
+            contents[i] = shorts[i]
+        if noise[4, i] < 0.03 and i > 0:
+            contents[i] = contents[int(noise[4, i] * 1e6) % i]
+
+    # 购买记录：2025年1-9月的日期 · 颜色 / 套餐 / 配置
+    start = date(2025, 1, 1)
+    offsets = rng.integers(0, (date(2025, 9, 30) - start).days + 1, size=n)
+    colors = _pick(rng, COLORS, n, COLOR_WEIGHTS)
+    configs = _pick(rng, CONFIGS, n, CONFIG_WEIGHTS)
+    product_nums = rng.integers(1, products + 1, size=n)
+    user_ids = rng.integers(1, 10 ** 6, size=n)
+
+    review_rows = []
+    for i in range(n):
+        day = start + timedelta(days=int(offsets[i]))
+        purchase = f'{day.year}年{day.month}月{day.day}日 · {colors[i]} / 官方标配 / {configs[i]}'
+        num = int(product_nums[i])
+        review_rows.append([num, product_rows[num - 1][1][:50], f't**{user_ids[i]}', purchase, contents[i]])
+    return product_rows, review_rows
+
+
+def write_workbook(path, n, seed=0):
+    """生成n条评论并写入Excel（write_only模式逐行写出）"""
+    product_rows, review_rows = generate_reviews(n, seed)
+    wb = op.Workbook(write_only=True)
+    for title, header, rows in (('商品列表', PRODUCT_HEADER, product_rows), ('商品评论', REVIEW_HEADER, review_rows)):
+        ws = wb.create_sheet(title=title)
+        ws.append(header)
+        for row in rows:
+            ws.append(row)
+    wb.save(path)
+    return path
+
+
+if __name__ == '__main__':
+    if len(sys.argv) < 2:
+        print("用法: python 生成测试数据.py 评论条数 [输出目录]")
+        exit(1)
+    count = int(sys.argv[1])
+    output_dir = sys.argv[2] if len(sys.argv) > 2 else '.'
+    os.makedirs(output_dir, exist_ok=True)
+    output_file = write_workbook(os.path.join(output_dir, DEFAULT_FILENAME), count)
+    print(f"✅ 已生成 {count:,} 条评论: {output_file}（{os.path.getsize(output_file)/1024/1024:.1f} MB）")
@@ -1,9 +1,23 @@
 import pandas as pd
-import openpyxl
+import argparse
 import os
 from datetime import datetime
 import sys
 
+# 引入项目根目录下的公共模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from 公共模块.流式统计 import open_workbook, iter_sheet_chunks, SheetStats, ReviewStats
+
+# 每次读取的行数
+CHUNK_SIZE = 20000
+# 近似模式下布隆过滤器的设计容量（行数）
+APPROX_CAPACITY = 10_000_000
+
+parser = argparse.ArgumentParser(description='淘宝商品评论数据质量检查')
+parser.add_argument('--approx', action='store_true',
+                    help='近似模式：重复行用布隆过滤器估计，各列唯一值用HyperLogLog估计，适合超大文件')
+args = parser.parse_args()
+
 # 创建报告文件
 report_file = f'数据质量检查报告_{datetime.now().strftime("%Y%m%d_%H%M%S")}.txt'
 
@@ -32,6 +46,8 @@ print("淘宝商品评论数据质量检查报告".center(80))
 print("="*80)
 print(f"检查时间: {datetime.now().strftime('%Y年%m月%d日 %H:%M:%S')}")
 print(f"报告文件: {report_file}")
+if args.approx:
+    print(f"检查模式: 近似（布隆过滤器 + HyperLogLog）")
 print("="*80)
 
 # 查找最新的Excel文件
@@ -52,9 +68,9 @@ print(f"   修改时间: {datetime.fromtimestamp(os.path.getmtime(latest_file)).
 # 用于收集所有异常
 all_issues = []
 
-# 读取Excel文件
+# 读取Excel文件（只读模式逐块读取，边读边累计统计，内存占用与数据量无关）
 try:
-    wb = openpyxl.load_workbook(latest_file)
+    wb = open_workbook(latest_file)
     print(f"\n📊 包含的Sheet: {', '.join(wb.sheetnames)}")
     
     for sheet_name in wb.sheetnames:
@@ -62,112 +78,129 @@ try:
         print(f"📄 Sheet: {sheet_name}".center(80))
         print(f"{'='*80}")
         
-        # 使用pandas读取
-        df = pd.read_excel(latest_file, sheet_name=sheet_name)
+        stats = None
+        review_stats = ReviewStats() if sheet_name == '商品评论' else None
+        for columns, rows in iter_sheet_chunks(wb, sheet_name, CHUNK_SIZE):
+            if stats is None:
+                stats = SheetStats(columns, approximate=args.approx, capacity=APPROX_CAPACITY)
+            chunk = pd.DataFrame(rows, columns=columns, index=range(stats.rows, stats.rows + len(rows)))
+            if review_stats is not None:
+                review_stats.update(chunk)
+            stats.update(chunk, rows)
+        if stats is None:
+            print("\n   ⚠️ 空Sheet，跳过")
+            continue
+        total = stats.rows
         
         print(f"\n【一、基本信息】")
-        print(f"   ├─ 总行数: {len(df):,} 行")
-        print(f"   ├─ 总列数: {len(df.columns)} 列")
-        print(f"   └─ 列名: {', '.join(df.columns)}")
+        print(f"   ├─ 总行数: {total:,} 行")
+        print(f"   ├─ 总列数: {len(stats.columns)} 列")
+        print(f"   └─ 列名: {', '.join(stats.columns)}")
         
         print(f"\n【二、数据预览（前3行）】")
         print("-" * 80)
-        for idx, row in df.head(3).iterrows():
+        for idx, row in enumerate(stats.preview):
             print(f"第{idx+1}行:")
-            for col in df.columns:
+            for col in stats.columns:
                 value = str(row[col])[:50] if pd.notna(row[col]) else 'NaN'
                 print(f"   {col}: {value}")
             print("-" * 80)
         
         print(f"\n【三、数据类型】")
-        for col, dtype in df.dtypes.items():
+        for col, dtype in stats.dtypes().items():
             print(f"   {col:20s} : {dtype}")
         
         print(f"\n【四、数据完整性检查】")
-        missing = df.isnull().sum()
-        missing_percent = (df.isnull().sum() / len(df) * 100).round(2)
+        missing = stats.missing
         
-        if missing.sum() > 0:
+        if sum(missing.values()) > 0:
             print("   ⚠️ 发现缺失值:")
-            for col in df.columns:
+            for col in stats.columns:
                 if missing[col] > 0:
-                    print(f"      ├─ {col}: {missing[col]} 个 ({missing_percent[col]:.1f}%)")
+                    missing_percent = round(missing[col] / total * 100, 2)
+                    print(f"      ├─ {col}: {missing[col]} 个 ({missing_percent:.1f}%)")
                     all_issues.append({
                         'sheet': sheet_name,
                         'type': '缺失值',
                         'column': col,
                         'count': missing[col],
-                        'percent': missing_percent[col]
+                        'percent': missing_percent
                     })
         else:
             print("   ✅ 无缺失值")
         
         print(f"\n【五、重复数据检查】")
-        duplicates = df.duplicated().sum()
+        duplicates = stats.duplicates()
+        if args.approx:
+            print(f"   （近似模式：布隆过滤器估计，误判率约 {stats.duplicate_error_rate():.4%}）")
         if duplicates > 0:
-            print(f"   ⚠️ 完全重复行数: {duplicates} ({duplicates/len(df)*100:.2f}%)")
+            print(f"   ⚠️ 完全重复行数: {'约' if args.approx else ''}{duplicates} ({duplicates/total*100:.2f}%)")
             all_issues.append({
                 'sheet': sheet_name,
                 'type': '重复数据',
                 'count': duplicates,
-                'percent': duplicates/len(df)*100
+                'percent': duplicates/total*100
             })
         else:
             print("   ✅ 无重复数据")
         
+        if args.approx:
+            print(f"\n   ▶ 各列唯一值个数（HyperLogLog估计，误差约1%）:")
+            for col, distinct in stats.distinct_counts().items():
+                print(f"      ├─ {col}: 约 {distinct:,} 个")
+        
         print(f"\n【六、空白值检查】")
         has_blank = False
-        for col in df.columns:
-            if df[col].dtype == 'object':
-                empty_count = (df[col].astype(str).str.strip() == '').sum()
-                if empty_count > 0:
-                    if not has_blank:
-                        print("   ⚠️ 发现空白值:")
-                        has_blank = True
-                    print(f"      ├─ {col}: {empty_count} 个 ({empty_count/len(df)*100:.2f}%)")
+        for col in stats.columns:
+            empty_count = stats.blank[col]
+            if empty_count > 0:
+                if not has_blank:
+                    print("   ⚠️ 发现空白值:")
+                    has_blank = True
+                print(f"      ├─ {col}: {empty_count} 个 ({empty_count/total*100:.2f}%)")
         if not has_blank:
             print("   ✅ 无空白值")
         
-        if sheet_name == '商品评论':
+        if review_stats is not None:
             print(f"\n{'='*80}")
             print(f"【七、评论内容质量分析】")
             print(f"{'='*80}")
             
             # 检查评论长度
-            if '评论内容' in df.columns:
-                df['评论长度'] = df['评论内容'].astype(str).str.len()
+            if '评论内容' in stats.columns:
+                mean_length, min_length, max_length, median_length = review_stats.length_summary()
                 
                 print(f"\n▶ 评论长度统计:")
-                print(f"   ├─ 平均长度: {df['评论长度'].mean():.0f} 字")
-                print(f"   ├─ 最短评论: {df['评论长度'].min()} 字")
-                print(f"   ├─ 最长评论: {df['评论长度'].max()} 字")
-                print(f"   └─ 中位数: {df['评论长度'].median():.0f} 字")
+                print(f"   ├─ 平均长度: {mean_length:.0f} 字")
+                print(f"   ├─ 最短评论: {min_length} 字")
+                print(f"   ├─ 最长评论: {max_length} 字")
+                print(f"   └─ 中位数: {median_length:.0f} 字")
                 
                 # 检查异常短评论
-                short_reviews = df[df['评论长度'] < 5]
-                if len(short_reviews) > 0:
-                    print(f"\n   ⚠️ 异常短评论(少于5字): {len(short_reviews)} 条 ({len(short_reviews)/len(df)*100:.2f}%)")
+                short_count = review_stats.short_count
+                if short_count > 0:
+                    print(f"\n   ⚠️ 异常短评论(少于5字): {short_count} 条 ({short_count/total*100:.2f}%)")
                     print(f"\n   【异常短评论详情】")
                     print("   " + "-" * 76)
-                    for idx, row in short_reviews.head(10).iterrows():
+                    for idx, row in review_stats.short_examples:
                         print(f"   序号{idx+1}:")
                         print(f"      用户: {row['用户名']}")
                         print(f"      购买: {row.get('购买记录', 'N/A')}")
                         print(f"      内容: {row['评论内容']}")
                         print(f"      长度: {row['评论长度']} 字")
                         print("   " + "-" * 76)
-                    if len(short_reviews) > 10:
-                        print(f"   （仅显示前10条，共{len(short_reviews)}条）")
+                    if short_count > 10:
+                        print(f"   （仅显示前10条，共{short_count}条）")
                 else:
                     print(f"\n   ✅ 无异常短评论")
                 
                 # 检查包含商家回复的评论
-                seller_reply_reviews = df[df['评论内容'].astype(str).str.contains('商家回复|店家回复|卖家回复', na=False)]
-                if len(seller_reply_reviews) > 0:
-                    print(f"\n▶ 包含商家回复: {len(seller_reply_reviews)} 条 ({len(seller_reply_reviews)/len(df)*100:.1f}%)")
+                seller_reply_count = review_stats.seller_reply_count
+                if seller_reply_count > 0:
+                    print(f"\n▶ 包含商家回复: {seller_reply_count} 条 ({seller_reply_count/total*100:.1f}%)")
                     print(f"\n   【包含商家回复的评论示例】")
                     print("   " + "-" * 76)
-                    for idx, row in seller_reply_reviews.head(3).iterrows():
+                    for idx, row in review_stats.seller_reply_examples:
                         print(f"   序号{idx+1}:")
                         print(f"      用户: {row['用户名']}")
                         content = row['评论内容'][:200] + '...' if len(row['评论内容']) > 200 else row['评论内容']
@@ -176,49 +209,48 @@ try:
                     all_issues.append({
                         'sheet': sheet_name,
                         'type': '包含商家回复',
-                        'count': len(seller_reply_reviews),
-                        'percent': len(seller_reply_reviews)/len(df)*100
+                        'count': seller_reply_count,
+                        'percent': seller_reply_count/total*100
                     })
                 else:
                     print(f"\n   ✅ 无商家回复混入")
                 
                 # 检查包含"\n更多"标记
-                more_tag_reviews = df[df['评论内容'].astype(str).str.contains('更多', na=False)]
-                if len(more_tag_reviews) > 0:
-                    print(f"\n▶ 包含'更多'标记: {len(more_tag_reviews)} 条 ({len(more_tag_reviews)/len(df)*100:.1f}%)")
+                more_tag_count = review_stats.more_tag_count
+                if more_tag_count > 0:
+                    print(f"\n▶ 包含'更多'标记: {more_tag_count} 条 ({more_tag_count/total*100:.1f}%)")
                     all_issues.append({
                         'sheet': sheet_name,
                         'type': "包含'更多'标记",
-                        'count': len(more_tag_reviews),
-                        'percent': len(more_tag_reviews)/len(df)*100
+                        'count': more_tag_count,
+                        'percent': more_tag_count/total*100
                     })
                 
                 # 检查换行符
-                newline_reviews = df[df['评论内容'].astype(str).str.contains('\n|\r', na=False, regex=True)]
-                if len(newline_reviews) > 0:
-                    print(f"\n▶ 包含换行符: {len(newline_reviews)} 条 ({len(newline_reviews)/len(df)*100:.1f}%)")
+                newline_count = review_stats.newline_count
+                if newline_count > 0:
+                    print(f"\n▶ 包含换行符: {newline_count} 条 ({newline_count/total*100:.1f}%)")
                     all_issues.append({
                         'sheet': sheet_name,
                         'type': '包含换行符',
-                        'count': len(newline_reviews),
-                        'percent': len(newline_reviews)/len(df)*100
+                        'count': newline_count,
+                        'percent': newline_count/total*100
                     })
             
             # 检查购买记录完整性
-            if '购买记录' in df.columns:
+            if review_stats.has_purchase_column:
                 print(f"\n▶ 购买记录完整性:")
-                has_purchase = df['购买记录'].notna() & (df['购买记录'].astype(str).str.strip() != '')
-                print(f"   ├─ 包含购买记录: {has_purchase.sum()} 条 ({has_purchase.sum()/len(df)*100:.1f}%)")
+                purchase_count = review_stats.purchase_count
+                print(f"   ├─ 包含购买记录: {purchase_count} 条 ({purchase_count/total*100:.1f}%)")
                 
-                missing_purchase = len(df) - has_purchase.sum()
+                missing_purchase = total - purchase_count
                 if missing_purchase > 0:
-                    print(f"   └─ ⚠️ 缺失购买记录: {missing_purchase} 条 ({missing_purchase/len(df)*100:.1f}%)")
+                    print(f"   └─ ⚠️ 缺失购买记录: {missing_purchase} 条 ({missing_purchase/total*100:.1f}%)")
                     
                     # 显示缺失购买记录的评论
-                    no_purchase_reviews = df[~has_purchase]
                     print(f"\n   【缺失购买记录的评论示例】")
                     print("   " + "-" * 76)
-                    for idx, row in no_purchase_reviews.head(5).iterrows():
+                    for idx, row in review_stats.missing_purchase_examples:
                         print(f"   序号{idx+1}:")
                         print(f"      用户: {row['用户名']}")
                         print(f"      购买记录: {row.get('购买记录', 'N/A')}")
@@ -230,10 +262,12 @@ try:
                         'sheet': sheet_name,
                         'type': '缺失购买记录',
                         'count': missing_purchase,
-                        'percent': missing_purchase/len(df)*100
+                        'percent': missing_purchase/total*100
                     })
                 else:
                     print(f"   └─ ✅ 购买记录100%完整")
+    
+    wb.close()
 
 except Exception as e:
     print(f"\n❌ 读取文件出错: {e}")
@@ -242,7 +276,7 @@ except Exception as e:
 
 # 生成总结报告
 print(f"\n{'='*80}")
-print(f"【检查总结】"。center(80))
+print(f"【检查总结】".center(80))
 print(f"{'='*80}")
 
 if all_issues:
@@ -1,7 +1,119 @@
 import pandas as pd
+import argparse
 import os
+import sys
+import time
 from datetime import datetime
 import re
+from collections import Counter
+
+# 引入项目根目录下的公共模块
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from 公共模块.近似去重 import find_near_duplicates, cluster_sizes
+
+# 近似重复检测的Jaccard相似度阈值（可用 --jaccard 指定，0表示不检测）
+NEAR_DUPLICATE_THRESHOLD = 0.8
+
+# 评论清洗规则：预编译为一个交替正则，每条评论只扫描一次（按顺序尝试，先匹配的规则优先）
+#   商家回复  "商家回复：/店家回复：/卖家回复："及之后的全部内容，连同前面的空白
+#             （回复前紧挨着的"更多"标记一并移除）
+#   更多      结尾的"更多"标记，连同前后的空白
+#   空白      换行符、制表符等空白字符及连续空白，替换为一个空格（单个空格无需替换，不参与匹配）
+# 开头的前瞻只允许在空白或"更/商/店/卖"处尝试匹配，其余位置直接跳过，扫描速度快数倍
+CLEAN_PATTERN = re.compile(
+    r'(?=[\s更商店卖])(?:'
+    r'(?P<商家回复>\s*(?P<回复前更多>更多\s*)?(?:商家|店家|卖家)回复[:：].*)'
+    r'|(?P<更多>\s*更多\s*$)'
+    r'|(?P<空白>\s{2,}|[^\S ])'
+    r')',
+    re.DOTALL,
+)
+SELLER_REPLY_KEYWORDS = re.compile('商家回复|店家回复|卖家回复')
+
+
+def remove_duplicate_content(text):
+    """移除重复的评论内容（同一句话重复出现两次时只保留前半部分）"""
+    # 检查是否前半部分和后半部分相同
+    length = len(text)
+    if length > 40:  # 只处理较长的文本
+        mid = length // 2
+        first_half = text[:mid].strip()
+        second_half = text[mid:mid*2].strip()
+        # 如果前半部分和后半部分完全相同，只保留前半部分
+        if first_half == second_half and len(first_half) > 20:
+            return first_half
+    return text
+
+
+def clean_review(text, stats):
+    """清洗一条评论（步骤1~5：商家回复、"更多"标记、换行符、多余空白、重复内容），命中的规则计入stats"""
+    match = CLEAN_PATTERN.search(text)
+    if match is not None:  # 大部分评论没有命中任何规则，直接跳过
+        pieces = []
+        last = 0
+        newline = blank = False
+        while match is not None:
+            pieces.append(text[last:match.start()])
+            last = match.end()
+            if match.group('商家回复') is not None:
+                stats['商家回复'] += 1
+                if match.group('回复前更多') is not None:
+                    stats['更多'] += 1
+            elif match.group('更多') is not None:
+                stats['更多'] += 1
+            else:
+                pieces.append(' ')
+                if '\n' in match.group() or '\r' in match.group():
+                    newline = True
+                else:
+                    blank = True
+            match = CLEAN_PATTERN.search(text, last)
+        pieces.append(text[last:])
+        text = ''.join(pieces)
+        if newline:
+            stats['换行符'] += 1
+        if blank:
+            stats['多余空白'] += 1
+    text = text.strip()
+
+    if len(text) > 40:
+        deduplicated = remove_duplicate_content(text)
+        if len(deduplicated) < len(text):
+            stats['重复内容'] += 1
+            stats['重复字符'] += len(text) - len(deduplicated)
+            return deduplicated
+    return text
+
+
+def clean_reviews(contents):
+    """清洗评论内容列
+    :param contents: 评论内容Series
+    :return: (清洗后的评论列表, 统计Counter)，统计包括清洗前的问题（含商家回复、含更多、含换行符、过短）
+             和各清洗规则的命中评论数
+    """
+    stats = Counter()
+    cleaned = []
+    for text in contents.astype(str).tolist():
+        if not isinstance(text, str):  # 空白单元格（astype(str)后仍为NaN）保持不变，也不计入清洗前的问题
+            cleaned.append(text)
+            continue
+        # 清洗前的问题
+        if '回复' in text and SELLER_REPLY_KEYWORDS.search(text):
+            stats['含商家回复'] += 1
+        if '更多' in text:
+            stats['含更多'] += 1
+        if '\n' in text or '\r' in text:
+            stats['含换行符'] += 1
+        if len(text) < 5:
+            stats['过短'] += 1
+        cleaned.append(clean_review(text, stats))
+    return cleaned, stats
+
+
+parser = argparse.ArgumentParser(description='淘宝评论数据清洗工具')
+parser.add_argument('--jaccard', type=float, default=NEAR_DUPLICATE_THRESHOLD,
+                    help=f'近似重复评论的Jaccard相似度阈值，默认{NEAR_DUPLICATE_THRESHOLD}，0表示不检测')
+args = parser.parse_args()
 
 print("="*80)
 print("淘宝评论数据清洗工具".center(80))
@@ -19,18 +131,24 @@ print(f"   文件大小: {os.path.getsize(latest_file)/1024:.2f} KB")
 
 # 读取数据
 try:
-    df_review = pd.read_excel(latest_file, sheet_name='商品评论')
+    # 一次读取所有Sheet：清洗其中的商品评论，其余Sheet（商品列表）保存时原样写回，不再二次读取原始文件
+    all_sheets = pd.read_excel(latest_file, sheet_name=None)
+    df_review = all_sheets['商品评论']
     original_count = len(df_review)
     print(f"\n📊 原始数据统计:")
     print(f"   - 评论总数: {original_count:,} 条")
     print(f"   - 平均长度: {df_review['评论内容'].astype(str).str.len().mean():.0f} 字")
     
+    # 一次扫描完成清洗步骤1~5，同时统计清洗前的问题和各规则命中数
+    cleaned_texts, stats = clean_reviews(df_review['评论内容'])
+    df_review['评论内容'] = cleaned_texts
+
     # 统计清洗前的问题
     print(f"\n🔍 清洗前数据质量:")
-    seller_reply_count = df_review['评论内容'].astype(str).str.contains('商家回复|店家回复|卖家回复', na=False).sum()
-    more_tag_count = df_review['评论内容'].astype(str).str.contains('更多', na=False).sum()
-    newline_count = df_review['评论内容'].astype(str).str.contains('\n|\r', na=False, regex=True).sum()
-    short_count = (df_review['评论内容'].astype(str).str.len() < 5).sum()
+    seller_reply_count = stats['含商家回复']
+    more_tag_count = stats['含更多']
+    newline_count = stats['含换行符']
+    short_count = stats['过短']
     
     print(f"   - 包含商家回复: {seller_reply_count} 条 ({seller_reply_count/original_count*100:.1f}%)")
     print(f"   - 包含'更多'标记: {more_tag_count} 条 ({more_tag_count/original_count*100:.1f}%)")
@@ -42,84 +160,29 @@ try:
     print("开始数据清洗...".center(80))
     print(f"{'='*80}")
     
-    # 步骤1: 移除商家回复
-    print(f"\n[1/7] 移除商家回复...")
-    def remove_seller_reply(text):
-        if pd.isna(text):
-            return text
-        text = str(text)
-        # 移除"商家回复："及之后的所有内容（包括前面的换行符）
-        patterns = [
-            r'\s*\n\s*商家回复[:：].*',
-            r'\s*商家回复[:：].*',
-            r'\s*\n\s*店家回复[:：].*',
-            r'\s*店家回复[:：].*',
-            r'\s*\n\s*卖家回复[:：].*',
-            r'\s*卖家回复[:：].*'
-        ]
-        for pattern in patterns:
-            text = re.sub(pattern, '', text, flags=re.DOTALL)
-        return text.strip()
-    
-    before = df_review['评论内容'].astype(str).str.contains('商家回复', na=False).sum()
-    df_review['评论内容'] = df_review['评论内容'].apply(remove_seller_reply)
-    after = df_review['评论内容'].astype(str).str.contains('商家回复', na=False).sum()
-    print(f"      ✓ 移除了 {before - after} 条评论中的商家回复")
-    
-    # 步骤2: 移除"更多"标记
-    print(f"[2/7] 移除'更多'标记...")
-    before = df_review['评论内容'].astype(str).str.contains('更多', na=False).sum()
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.replace(r'\s*\n\s*更多\s*$', '', regex=True)
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.replace(r'\s*更多\s*$', '', regex=True)
-    after = df_review['评论内容'].astype(str).str.contains('更多', na=False).sum()
-    print(f"      ✓ 清理了 {before - after} 条评论中的'更多'标记")
-    
-    # 步骤3: 清理换行符
-    print(f"[3/7] 清理换行符...")
-    before = df_review['评论内容'].astype(str).str.contains('\n|\r', na=False, regex=True).sum()
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.replace('\n', ' ')
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.replace('\r', ' ')
-    after = df_review['评论内容'].astype(str).str.contains('\n|\r', na=False, regex=True).sum()
-    print(f"      ✓ 清理了 {before - after} 条评论中的换行符")
-    
-    # 步骤4: 清理多余空白
-    print(f"[4/7] 清理多余空白字符...")
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.replace(r'\s+', ' ', regex=True)
-    df_review['评论内容'] = df_review['评论内容'].astype(str).str.strip()
-    print(f"      ✓ 完成")
-    
-    # 步骤5: 移除重复的评论内容（同一句话重复出现两次）
-    print(f"[5/7] 检测并移除重复内容...")
-    def remove_duplicate_content(text):
-        if pd.isna(text) or text == '':
-            return text
-        text = str(text).strip()
-        # 检查是否前半部分和后半部分相同
-        length = len(text)
-        if length > 40:  # 只处理较长的文本
-            mid = length // 2
-            first_half = text[:mid].strip()
-            second_half = text[mid:mid*2].strip()
-            # 如果前半部分和后半部分完全相同，只保留前半部分
-            if first_half == second_half and len(first_half) > 20:
-                return first_half
-        return text
-    
-    before_lengths = df_review['评论内容'].astype(str).str.len().sum()
-    df_review['评论内容'] = df_review['评论内容'].apply(remove_duplicate_content)
-    after_lengths = df_review['评论内容'].astype(str).str.len().sum()
-    reduced_chars = before_lengths - after_lengths
-    print(f"      ✓ 移除了约 {reduced_chars:,} 个重复字符")
+    # 步骤1~5已在上面的一次扫描中完成，这里输出各规则的命中数
+    print(f"\n[1/8] 移除商家回复...")
+    print(f"      ✓ 移除了 {stats['商家回复']} 条评论中的商家回复")
+    print(f"[2/8] 移除'更多'标记...")
+    print(f"      ✓ 清理了 {stats['更多']} 条评论中的'更多'标记")
+    print(f"[3/8] 清理换行符...")
+    print(f"      ✓ 清理了 {stats['换行符']} 条评论中的换行符")
+    print(f"[4/8] 清理多余空白字符...")
+    print(f"      ✓ 清理了 {stats['多余空白']} 条评论中的多余空白")
+    print(f"[5/8] 检测并移除重复内容...")
+    print(f"      ✓ 移除了约 {stats['重复字符']:,} 个重复字符（{stats['重复内容']} 条评论）")
     
     # 步骤6: 移除异常短评论（少于3字）
-    print(f"[6/7] 移除异常短评论...")
+    print(f"[6/8] 移除异常短评论...")
     before_count = len(df_review)
     df_review['评论长度_temp'] = df_review['评论内容'].astype(str).str.len()
     short_reviews = df_review[df_review['评论长度_temp'] < 3]
     if len(short_reviews) > 0:
         print(f"\n      以下评论将被移除:")
-        for idx, row in short_reviews.iterrows():
+        for idx, row in short_reviews.head(20).iterrows():
             print(f"         - [{row['用户名']}]: {row['评论内容']} (长度: {row['评论长度_temp']}字)")
+        if len(short_reviews) > 20:
+            print(f"         ... 等共 {len(short_reviews)} 条")
     
     df_review = df_review[df_review['评论长度_temp'] >= 3]
     df_review = df_review.drop(columns=['评论长度_temp'])
@@ -127,12 +190,33 @@ try:
     print(f"\n      ✓ 移除 {removed_count} 条异常短评论")
     
     # 步骤7: 移除完全重复的评论
-    print(f"[7/7] 移除完全重复的评论...")
+    print(f"[7/8] 移除完全重复的评论...")
     before_count = len(df_review)
     df_review = df_review.drop_duplicates(subset=['评论内容'], keep='first')
     dedup_count = before_count - len(df_review)
     print(f"      ✓ 移除 {dedup_count} 条重复评论")
     
+    # 步骤8: 移除近似重复的评论（模板化、仅个别字词不同的评论只保留最早的一条）
+    print(f"[8/8] 移除近似重复的评论...")
+    near_dup_count = 0
+    near_dup_clusters = pd.Series(dtype='int64')
+    if args.jaccard > 0:
+        started = time.perf_counter()
+        near_dup_texts = df_review['评论内容'].tolist()
+        labels, near_dup_info = find_near_duplicates(near_dup_texts, threshold=args.jaccard)
+        near_dup_clusters = cluster_sizes(labels)
+        near_dup_seconds = time.perf_counter() - started
+        keep = labels == range(len(labels))
+        near_dup_count = int((~keep).sum())
+        df_review = df_review[keep]
+        print(f"      ✓ 发现 {len(near_dup_clusters)} 个近似重复簇（Jaccard ≥ {args.jaccard}），"
+              f"移除 {near_dup_count} 条评论（{near_dup_seconds:.1f}秒）")
+        for rep, size in near_dup_clusters.head(5).items():
+            text = near_dup_texts[rep]
+            print(f"         - [{size}条] {text[:50] + '...' if len(text) > 50 else text}")
+    else:
+        print(f"      - 已跳过（--jaccard 0）")
+    
     # 重新编号
     df_review = df_review.reset_index(drop=True)
     
@@ -167,9 +251,6 @@ try:
     # 保存清洗后的数据
     output_file = latest_file.replace('.xlsx', '_已清洗.xlsx')
     
-    # 读取所有Sheet
-    all_sheets = pd.read_excel(latest_file, sheet_name=None)
-    
     # 替换商品评论Sheet
     all_sheets['商品评论'] = df_review
     
@@ -208,13 +289,30 @@ try:
         f.write(f"移除: {removed_total} 条 ({removed_total/original_count*100:.2f}%)\n")
         f.write(f"保留率: {cleaned_count/original_count*100:.1f}%\n\n")
         f.write("清洗操作:\n")
-        f.write(f"  1. 移除商家回复\n")
-        f.write(f"  2. 移除'更多'标记\n")
-        f.write(f"  3. 清理换行符\n")
-        f.write(f"  4. 清理多余空白\n")
-        f.write(f"  5. 移除重复内容\n")
-        f.write(f"  6. 移除异常短评论\n")
-        f.write(f"  7. 移除完全重复评论\n")
+        f.write(f"  1. 移除商家回复: {stats['商家回复']} 条\n")
+        f.write(f"  2. 移除'更多'标记: {stats['更多']} 条\n")
+        f.write(f"  3. 清理换行符: {stats['换行符']} 条\n")
+        f.write(f"  4. 清理多余空白: {stats['多余空白']} 条\n")
+        f.write(f"  5. 移除重复内容: {stats['重复内容']} 条（{stats['重复字符']:,} 字）\n")
+        f.write(f"  6. 移除异常短评论: {removed_count} 条\n")
+        f.write(f"  7. 移除完全重复评论: {dedup_count} 条\n")
+        f.write(f"  8. 移除近似重复评论: {near_dup_count} 条\n")
+        if args.jaccard > 0:
+            sizes = near_dup_clusters
+            f.write("\n近似重复检测（MinHash + LSH）:\n")
+            f.write(f"  参数: Jaccard阈值 {args.jaccard}，{near_dup_info['num_perm']}个哈希，"
+                    f"LSH {near_dup_info['bands']}段×{near_dup_info['rows']}行，"
+                    f"字符{near_dup_info['shingle_size']}-gram\n")
+            f.write(f"  候选对: {near_dup_info['candidates']:,} 个，相似度达到阈值: {near_dup_info['pairs']:,} 个\n")
+            f.write(f"  近似重复簇: {len(sizes)} 个，涉及 {int(sizes.sum())} 条评论，移除 {near_dup_count} 条\n")
+            if len(sizes) > 0:
+                f.write(f"  最大簇: {int(sizes.iloc[0])} 条，平均簇大小: {sizes.mean():.1f} 条\n")
+                f.write(f"  簇大小分布: 2条 {(sizes == 2).sum()} 个 | 3-5条 {sizes.between(3, 5).sum()} 个 | "
+                        f"6-10条 {sizes.between(6, 10).sum()} 个 | 10条以上 {(sizes > 10).sum()} 个\n")
+                f.write("  最大的10个簇（保留的代表评论）:\n")
+                for rep, size in sizes.head(10).items():
+                    f.write(f"    - [{size}条] {near_dup_texts[rep][:80]}\n")
+            f.write(f"  耗时: {near_dup_seconds:.1f} 秒\n")
     
     print(f"\n📄 清洗日志已保存到: {log_file}")
     
@@ -223,4 +321,5 @@ try:
 except Exception as e:
     print(f"\n❌ 清洗失败: {e}")
     import traceback
-    traceback.print_exc() 
+    traceback.print_exc()
+    exit(1)  # 以非0状态退出，基准测试等调用方据此判断清洗失败
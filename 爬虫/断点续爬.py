@@ -0,0 +1,103 @@
+# -*- coding: utf-8 -*-
+"""
+断点续爬
+把爬取进度记录到断点文件（<输出文件名>.断点.json），内容包括：
+    - 本次爬取的参数（关键词、页码范围、是否爬评论、输出格式等）
+    - 已完成的页码
+    - 已完成的商品（商品链接 -> 商品序号、页码、评论数）
+    - 正在爬取的商品及其开始时两个Sheet的已写入行数（行偏移）
+程序中断后使用 `python 爬虫代码.py --resume` 重新运行：跳过已完成的页码和商品，
+把未完成商品已写入的部分回滚到行偏移处后重新爬取，并继续追加到原来的结果文件中。
+"""
+
+import glob
+import json
+import os
+
+CHECKPOINT_SUFFIX = '.断点.json'
+
+
+class CrawlCheckpoint:
+    """爬取进度断点"""
+
+    def __init__(self, output_base, config):
+        """
+        :param output_base: 输出文件名（不含扩展名），与结果写入器一致
+        :param config: 爬取参数字典，续爬时用于恢复参数
+        """
+        self.output_base = output_base
+        self.config = dict(config)
+        self.completed_pages = []
+        self.products = {}
+        self.in_progress = None
+
+    @property
+    def path(self):
+        return self.output_base + CHECKPOINT_SUFFIX
+
+    @classmethod
+    def load(cls, path):
+        with open(path, 'r', encoding='utf-8') as f:
+            state = json.load(f)
+        checkpoint = cls(state['output_base'], state['config'])
+        checkpoint.completed_pages = state['completed_pages']
+        checkpoint.products = state['products']
+        checkpoint.in_progress = state['in_progress']
+        return checkpoint
+
+    @classmethod
+    def find_latest(cls, directory='.'):
+        """返回目录下最新的断点文件路径，没有则返回None"""
+        files = glob.glob(os.path.join(glob.escape(directory), '*' + CHECKPOINT_SUFFIX))
+        if not files:
+            return None
+        return max(files, key=os.path.getmtime)
+
+    def save(self):
+        """写入断点文件（先写临时文件再替换，避免写到一半中断）"""
+        state = {
+            'output_base': self.output_base,
+            'config': self.config,
+            'completed_pages': self.completed_pages,
+            'products': self.products,
+            'in_progress': self.in_progress,
+        }
+        tmp_file = self.path + '.tmp'
+        with open(tmp_file, 'w', encoding='utf-8') as f:
+            json.dump(state, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_file, self.path)
+
+    def remove(self):
+        if os.path.exists(self.path):
+            os.remove(self.path)
+
+    def is_page_done(self, page):
+        return page in self.completed_pages
+
+    def next_page(self, page_start, page_end):
+        """返回第一个未完成的页码；全部完成时返回None"""
+        for page in range(page_start, page_end + 1):
+            if not self.is_page_done(page):
+                return page
+        return None
+
+    def is_product_done(self, url):
+        return url in self.products
+
+    def start_product(self, url, num, page, offsets):
+        """记录开始爬取某个商品
+        :param offsets: {Sheet名: 开始前已写入的行数}，续爬时回滚到这些位置
+        """
+        self.in_progress = {'url': url, 'num': num, 'page': page, 'offsets': dict(offsets)}
+        self.save()
+
+    def finish_product(self, url, num, page, review_total):
+        """记录商品（含评论）已全部写入"""
+        self.products[url] = {'num': num, 'page': page, 'reviews': review_total}
+        self.in_progress = None
+        self.save()
+
+    def finish_page(self, page):
+        if page not in self.completed_pages:
+            self.completed_pages.append(page)
+        self.save()
@@ -16,6 +16,7 @@
         'Title_URL'   ：商品详细页链接
         'Shop_URL'    ：商铺链接
         'Img_URL'     ：图片链接
+断点续爬：爬取中断后运行 python 爬虫代码.py --resume，跳过已完成的页码和商品，继续追加到原结果文件
 '''
 # 声明第三方库/头文件
 from selenium import webdriver
@@ -29,61 +30,105 @@ from pyquery import PyQuery as pq
 import time
 import random                       #用于随机等待，降低反爬风险
 import re                           #用于正则表达式匹配
-import openpyxl as op               #导入Excel读写库
+import sys
+from 结果写入 import StreamingSink, OUTPUT_FORMATS   #爬取结果流式写入（边爬边落盘）
+from 断点续爬 import CrawlCheckpoint, CHECKPOINT_SUFFIX   #爬取进度断点
+from 自适应等待 import AdaptiveWaiter   #按页面状态等待，替代固定sleep
+from 评论提取 import ReviewHarvester   #滚动过程中增量提取新加载的评论
+from 评论并发 import ReviewWorkerPool   #多浏览器并发爬取评论
  
 # 全局变量
 count = 1                                   # 写入Excel商品计数
 review_count = 1                            # 写入Excel评论计数
+sink = None                                 # 结果写入器（在__main__中创建）
+review_pool = None                          # 评论并发爬取池（并发数大于1时在__main__中创建）
+REVIEW_ITEM_SELECTOR = 'div.Comment--H5QmJwe9, div[class*="Comment--"]'   # 评论项选择器（滚动时统计评论数）
+GOODS_ITEM_SELECTOR = 'div.content--CUnfXXxv > div > div'                 # 搜索页商品块选择器
+STALE_ROUNDS = 5                            # 滚动后高度和评论数连续多少轮未变化视为加载完毕（每轮等待自适应退避）
  
 print("\n" + "="*60)
 print("淘宝商品信息爬虫 v2.0")
 print("功能：爬取商品基本信息 + 商品评论（可选）")
 print("="*60 + "\n")
 
-# 选择爬取模式
-print("请选择爬取模式：")
-print("1. 搜索关键词爬取")
-print("2. 指定店铺商品爬取")
-crawl_mode = input("输入模式编号（1或2，默认1）：").strip() or "1"
-
-if crawl_mode == "2":
-    # 指定店铺模式
-    SHOP_URL = input('输入店铺商品链接：').strip()
-    KEYWORD = "指定商品"
-    pageStart = 1
-    pageEnd = 1
-    LIMIT_PRODUCTS = 1
-    print(f"\n模式：指定店铺商品爬取")
+# 断点续爬：运行 python 爬虫代码.py --resume 时从最新的断点文件恢复爬取参数，不再重新输入
+RESUME = '--resume' in sys.argv
+checkpoint = None                           # 爬取进度断点（续爬时在此加载，否则在__main__中创建）
+if RESUME:
+    checkpoint_file = CrawlCheckpoint.find_latest()
+    if checkpoint_file is None:
+        print("未找到断点文件（*{}），请先正常运行一次爬虫".format(CHECKPOINT_SUFFIX))
+        exit(1)
+    checkpoint = CrawlCheckpoint.load(checkpoint_file)
+    SHOP_URL = checkpoint.config['SHOP_URL']
+    KEYWORD = checkpoint.config['KEYWORD']
+    pageStart = checkpoint.config['pageStart']
+    pageEnd = checkpoint.config['pageEnd']
+    LIMIT_PRODUCTS = checkpoint.config['LIMIT_PRODUCTS']
+    CRAWL_REVIEWS = checkpoint.config['CRAWL_REVIEWS']
+    REVIEW_WORKERS = checkpoint.config.get('REVIEW_WORKERS', 1)
+    OUTPUT_FORMAT = checkpoint.config['OUTPUT_FORMAT']
+    print(f"从断点继续爬取: {checkpoint_file}")
+    print(f"关键词：{KEYWORD}，页码：{pageStart}-{pageEnd}，已完成页码：{checkpoint.completed_pages}，"
+          f"已完成商品：{len(checkpoint.products)} 个\n")
 else:
-    # 搜索模式
-    SHOP_URL = None
-    KEYWORD = input('输入搜索的商品关键词Keyword：')# 要搜索的商品的关键词
-    pageStart = int(input('输入爬取的起始页PageStart：'))# 爬取起始页
-    pageEnd = int(input('输入爬取的终止页PageEnd：'))# 爬取终止页
-    
-    # 如果只爬取1页，询问是否限制商品数量
-    if pageStart == pageEnd:
-        limit_input = input(f'爬取商品数量（直接回车爬取整页，默认约44个）：').strip()
-        LIMIT_PRODUCTS = int(limit_input) if limit_input else None
-        if LIMIT_PRODUCTS:
-            print(f"将爬取前 {LIMIT_PRODUCTS} 个商品")
+    # 选择爬取模式
+    print("请选择爬取模式：")
+    print("1. 搜索关键词爬取")
+    print("2. 指定店铺商品爬取")
+    crawl_mode = input("输入模式编号（1或2，默认1）：").strip() or "1"
+
+    if crawl_mode == "2":
+        # 指定店铺模式
+        SHOP_URL = input('输入店铺商品链接：').strip()
+        KEYWORD = "指定商品"
+        pageStart = 1
+        pageEnd = 1
+        LIMIT_PRODUCTS = 1
+        print(f"\n模式：指定店铺商品爬取")
     else:
-        LIMIT_PRODUCTS = None
+        # 搜索模式
+        SHOP_URL = None
+        KEYWORD = input('输入搜索的商品关键词Keyword：')# 要搜索的商品的关键词
+        pageStart = int(input('输入爬取的起始页PageStart：'))# 爬取起始页
+        pageEnd = int(input('输入爬取的终止页PageEnd：'))# 爬取终止页
+    
+        # 如果只爬取1页，询问是否限制商品数量
+        if pageStart == pageEnd:
+            limit_input = input(f'爬取商品数量（直接回车爬取整页，默认约44个）：').strip()
+            LIMIT_PRODUCTS = int(limit_input) if limit_input else None
+            if LIMIT_PRODUCTS:
+                print(f"将爬取前 {LIMIT_PRODUCTS} 个商品")
+        else:
+            LIMIT_PRODUCTS = None
 
-CRAWL_REVIEWS = input('是否爬取商品评论？(y/n)：').lower() == 'y'  # 是否爬取评论
+    CRAWL_REVIEWS = input('是否爬取商品评论？(y/n)：').lower() == 'y'  # 是否爬取评论
+    
+    # 搜索模式下可用多个浏览器同时爬取不同商品的评论
+    REVIEW_WORKERS = 1
+    if CRAWL_REVIEWS and not SHOP_URL:
+        workers_input = input('同时爬取评论的浏览器数量（直接回车为1，即逐个商品爬取）：').strip()
+        REVIEW_WORKERS = max(1, int(workers_input)) if workers_input else 1
 
 if CRAWL_REVIEWS:
     print("\n提示：评论爬取会显著增加运行时间（每个商品约需30-60秒）")
     if LIMIT_PRODUCTS:
-        print(f"预计总时间：约{LIMIT_PRODUCTS * 0.8}分钟\n")
+        print(f"预计总时间：约{LIMIT_PRODUCTS * 0.8 / REVIEW_WORKERS:.1f}分钟\n")
     else:
-        print(f"预计总时间：约{(pageEnd-pageStart+1)*44*0.8}分钟（假设每页44个商品）\n")
+        print(f"预计总时间：约{(pageEnd-pageStart+1)*44*0.8 / REVIEW_WORKERS:.1f}分钟（假设每页44个商品，{REVIEW_WORKERS}个浏览器并发）\n")
     
     print("⚠️  反爬提示：")
     print("   - 爬取评论时可能触发淘宝滑块验证")
     print("   - 程序会自动检测并等待您手动完成验证")
     print("   - 完成验证后程序会自动继续")
     print("   - 为降低反爬风险，每个商品间会随机等待3-6秒\n")
+
+# 选择输出格式（爬取过程中数据会实时写入日志文件，结束时再转换为该格式）
+if not RESUME:
+    OUTPUT_FORMAT = input('输出格式（xlsx/csv/parquet，默认xlsx）：').strip().lower() or 'xlsx'
+    if OUTPUT_FORMAT not in OUTPUT_FORMATS:
+        print(f"未知格式 {OUTPUT_FORMAT}，使用默认格式xlsx")
+        OUTPUT_FORMAT = 'xlsx'
  
 # 启动ChromeDriver服务
 print("正在启动Chrome浏览器...")
@@ -134,6 +179,8 @@ else:
 # wait是Selenium中的一个等待类，用于在特定条件满足之前等待一定的时间(这里是20秒)。
 # 如果一直到等待时间都没满足则会捕获TimeoutException异常
 wait = WebDriverWait(driver,20)
+# 自适应等待：页面有变化立即继续，没有变化才逐步延长等待
+waiter = AdaptiveWaiter(driver)
 
 # 等待用户登录
 print("\n" + "="*60)
@@ -165,11 +212,11 @@ def search_goods():
         # 点击"搜索"按键
         submit.click()
         print("已点击搜索按钮，等待页面加载...")
-        # 搜索商品后等待5秒，如有滑块或验证，请手动处理
-        time.sleep(5)
+        # 搜索商品后等待页面稳定（最多10秒），如有滑块或验证，请手动处理
+        waiter.wait_page_settled(timeout=10)
         
         # 自动检测验证码
-        has_verification = detect_and_wait_for_verification(driver, "搜索结果页")
+        has_verification = detect_and_wait_for_verification(driver, "搜索结果页", waiter)
         
         if not has_verification:
             # 如果没有自动检测到验证，再询问用户
@@ -180,23 +227,23 @@ def search_goods():
     except Exception as exc:
         print("search_goods函数错误！Error：{}".format(exc))
  
-# 翻页至第pageStar页
-def turn_pageStart():
+# 翻页至第pageStar页（断点续爬时翻至第一个未完成的页码）
+def turn_pageStart(page_number=pageStart):
     try:
-        print("正在翻转:第{}页".format(pageStart))
+        print("正在翻转:第{}页".format(page_number))
         # 滑动到页面底端
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        # 滑动到底部后停留3s
-        time.sleep(3)
+        # 滑动到底部后等待分页栏加载完成
+        waiter.wait_page_settled(timeout=3)
         # 找到输入“页面”的表单，输入“起始页”
         pageInput = wait.until(EC.presence_of_element_located(
             (By.XPATH, '//*[@id="search-content-leftWrap"]/div[3]/div[3]/div/div/span[3]/input')))
-        pageInput.send_keys(pageStart)
+        pageInput.send_keys(page_number)
         # 找到页面跳转的“确定”按钮，并且点击
         admit = wait.until(EC.element_to_be_clickable(
             (By.XPATH, '//*[@id="search-content-leftWrap"]/div[3]/div[3]/div/div/button[3]')))
         admit.click()
-        print("已翻至:第{}页".format(pageStart))
+        print("已翻至:第{}页".format(page_number))
     except Exception as exc:
         print("turn_pageStart函数错误！Error：{}".format(exc))
         
@@ -204,8 +251,8 @@ def turn_pageStart():
 def page_turning(page_number):
     try:
         print("正在翻页: 第{}页".format(page_number))
-        # 强制等待2秒后翻页
-        time.sleep(2)
+        # 等待当前页稳定后翻页
+        waiter.wait_page_settled(timeout=2)
         # 找到"下一页"的按钮
         submit = wait.until(EC.element_to_be_clickable((By.XPATH, '//*[@id="search-content-leftWrap"]/div[3]/div[3]/div/div/button[2]')))
         submit.click()
@@ -237,6 +284,34 @@ def page_turning(page_number):
     except Exception as exc:
         print("page_turning函数错误！Error：{}".format(exc))
  
+# 写入一个商品及其评论并记录到断点（商品行与评论一起写入，保证评论按商品顺序排列）
+# reviews为None表示评论爬取失败：不写入该商品、不记入断点，返回False，续爬时重新爬取
+def save_product(product_key, page, product_row, reviews):
+    global review_count
+    product_num, title = product_row[0], product_row[1]
+    if reviews is None:
+        print(f"  └─ 商品{product_num}评论爬取失败，未写入，续爬时将重新爬取\n")
+        return False
+    
+    # 记录开始写入该商品及各Sheet当前行数，中断后续爬时回滚到这里
+    checkpoint.start_product(product_key, product_num, page, sink.row_counts)
+    
+    # 商品信息写入商品列表
+    sink.append('商品列表', product_row)
+    
+    # 将评论写入评论Sheet（商品序号、商品标题（截取）、用户名、购买记录（含时间）、评论内容）
+    for review in reviews:
+        sink.append('商品评论', [review['product_num'], title[:50], review['username'],
+                             review['purchase_info'], review['content']])
+        review_count += 1
+    if CRAWL_REVIEWS:
+        print(f"  └─ 商品{product_num}评论已保存 ({len(reviews)}条)\n")
+    
+    # 商品及评论已全部写入：刷盘后记录到断点
+    sink.flush()
+    checkpoint.finish_product(product_key, product_num, page, len(reviews))
+    return True
+
 # 获取每一页的商品信息；
 def get_goods(page):
     try:
@@ -245,18 +320,21 @@ def get_goods(page):
         
         # 滚动页面多次，确保所有商品都加载出来
         print(f"\n正在加载第{page}页的所有商品...")
+        state = waiter.snapshot(selector=GOODS_ITEM_SELECTOR)
+        waiter.reset()
         for i in range(5):  # 分5次滚动
-            scroll_height = (i + 1) * (driver.execute_script("return document.body.scrollHeight") // 5)
+            scroll_height = (i + 1) * (state['height'] // 5)
             driver.execute_script(f"window.scrollTo(0, {scroll_height});")
-            time.sleep(1.5)  # 每次滚动后等待1.5秒
+            # 每次滚动后等待懒加载的商品出现，无变化时自适应退避
+            _, state = waiter.wait_for_growth(state, selector=GOODS_ITEM_SELECTOR)
         
-        # 滚动到底部
+        # 滚动到底部，等待页面稳定
         driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-        time.sleep(3)
+        waiter.wait_page_settled(timeout=3)
         
         # 再滚回顶部，确保所有内容都已渲染
         driver.execute_script("window.scrollTo(0, 0);")
-        time.sleep(2)
+        waiter.wait_page_settled(timeout=2)
         
         print("页面加载完成，开始提取商品信息...")
         
@@ -264,10 +342,11 @@ def get_goods(page):
         html = driver.page_source
         doc = pq(html)
         # 提取所有商品的共同父元素的类选择器
-        items = list(doc('div.content--CUnfXXxv > div > div').items())
+        items = list(doc(GOODS_ITEM_SELECTOR).items())
         print(f"共找到 {len(items)} 个元素块")
         
         extracted_count = 0  # 实际提取的商品数
+        failed_count = 0     # 评论爬取失败、未写入的商品数
         for item in items:
             # 跳过非商品元素
             if item.find('.title--RoseSo8H').text() == '大家都在搜':
@@ -324,6 +403,16 @@ def get_goods(page):
                 img_elem = item.find('.mainPicAdaptWrapper--V_ayd2hD img')
                 img_url = img_elem.attr('src') if img_elem else ""
                 
+                # 断点续爬：已完成的商品直接跳过（仍计入本页商品数量）
+                product_key = t_url or f"{page}|{title}"
+                if checkpoint.is_product_done(product_key):
+                    print(f"[{extracted_count + 1}] {title[:30]}... - 已爬取，跳过")
+                    extracted_count += 1
+                    if LIMIT_PRODUCTS and extracted_count >= LIMIT_PRODUCTS:
+                        print(f"✓ 已达到指定数量 {LIMIT_PRODUCTS} 个商品，停止爬取本页")
+                        break
+                    continue
+                
                 # 构建商品信息字典
                 product = {
                     'Page':         page,
@@ -340,44 +429,33 @@ def get_goods(page):
                 }
                 print(f"[{extracted_count + 1}] {title[:30]}... - ¥{price}")
                 
-                # 商品信息写入Excel表格中
-                wb.cell(row=count, column=1, value=count-1)                 # 序号
-                wb.cell(row=count, column=2, value=title)               # 标题
-                wb.cell(row=count, column=3, value=price)               # 价格
-                wb.cell(row=count, column=4, value=deal)           # 付款人数
-                wb.cell(row=count, column=5, value=location)            # 地理位置
-                wb.cell(row=count, column=6, value=shop)                # 店铺名称
-                wb.cell(row=count, column=7, value=postText)            # 是否包邮
-                wb.cell(row=count, column=8, value=t_url)               # 商品链接
-                wb.cell(row=count, column=9, value=shop_url)           # 商铺链接
-                wb.cell(row=count, column=10, value=img_url)            # 图片链接
-                
                 product_num = count - 1  # 商品序号
                 count += 1                                              # 下一行
                 extracted_count += 1
+                # 商品列表行（序号、标题、价格、付款人数、地理位置、店铺名称、是否包邮、商品链接、商铺链接、图片链接）
+                product_row = [product_num, title, price, deal, location, shop, postText, t_url, shop_url, img_url]
+                review_url = t_url if CRAWL_REVIEWS and t_url else None
                 
-                # 如果启用了评论爬取，则爬取该商品的评论
-                if CRAWL_REVIEWS and t_url:
-                    global review_count
-                    print(f"  └─ 开始爬取商品评论...")
-                    
-                    # 随机等待3-6秒，模拟人工操作，降低反爬风险
-                    wait_time = random.uniform(3, 6)
-                    print(f"  └─ 等待 {wait_time:.1f} 秒（模拟人工操作，降低反爬风险）...")
-                    time.sleep(wait_time)
-                    
-                    reviews = get_product_reviews(t_url, title, product_num)
-                    
-                    # 将评论写入评论Sheet
-                    for review in reviews:
-                        wb_review.cell(row=review_count, column=1, value=review['product_num'])      # 商品序号
-                        wb_review.cell(row=review_count, column=2, value=title[:50])                # 商品标题（截取）
-                        wb_review.cell(row=review_count, column=3, value=review['username'])        # 用户名
-                        wb_review.cell(row=review_count, column=4, value=review['purchase_info'])   # 购买记录（含时间）
-                        wb_review.cell(row=review_count, column=5, value=review['content'])         # 评论内容
-                        review_count += 1
-                    
-                    print(f"  └─ 该商品评论已保存 ({len(reviews)}条)\n")
+                if review_pool:
+                    # 并发模式：交给评论爬取池，已完成的商品按商品顺序写入
+                    review_pool.submit((product_key, page, product_row), review_url, title, product_num)
+                    for (done_key, done_page, done_row), reviews in review_pool.completed():
+                        if not save_product(done_key, done_page, done_row, reviews):
+                            failed_count += 1
+                else:
+                    reviews = []
+                    # 如果启用了评论爬取，则爬取该商品的评论
+                    if review_url:
+                        print(f"  └─ 开始爬取商品评论...")
+                        
+                        # 随机等待3-6秒，模拟人工操作，降低反爬风险
+                        wait_time = random.uniform(3, 6)
+                        print(f"  └─ 等待 {wait_time:.1f} 秒（模拟人工操作，降低反爬风险）...")
+                        time.sleep(wait_time)
+                        
+                        reviews = get_product_reviews(review_url, title, product_num)
+                    if not save_product(product_key, page, product_row, reviews):
+                        failed_count += 1
                 
                 # 检查是否达到限制数量
                 if LIMIT_PRODUCTS and extracted_count >= LIMIT_PRODUCTS:
@@ -389,19 +467,34 @@ def get_goods(page):
                 print(f"跳过一个商品（提取失败）: {item_exc}")
                 continue
         
+        if review_pool:
+            # 等待本页剩余商品的评论爬取完成，按商品顺序写入
+            print(f"等待本页剩余商品的评论爬取完成...")
+            for (done_key, done_page, done_row), reviews in review_pool.completed(block=True):
+                if not save_product(done_key, done_page, done_row, reviews):
+                    failed_count += 1
+        
         print(f"第{page}页提取完成，共提取 {extracted_count} 个商品\n")
+        if failed_count:
+            # 有商品未写入时不把本页记为已完成，续爬时重新进入本页（已完成的商品会跳过）
+            print(f"⚠️  第{page}页有 {failed_count} 个商品评论爬取失败，本页未记为完成\n")
+            return False
+        return True
         
     except Exception as exc:
         print("get_goods函数错误！Error：{}".format(exc))
+        return False
  
 # 检测并等待用户完成验证码
-def detect_and_wait_for_verification(driver, page_name="当前页面"):
+def detect_and_wait_for_verification(driver, page_name="当前页面", waiter=None):
     """
     检测页面是否出现验证码，如果有则等待用户手动完成
     :param driver: webdriver实例
     :param page_name: 页面名称（用于提示）
+    :param waiter: 该浏览器的自适应等待，默认按driver新建（并发爬取时传入工作线程自己的等待）
     :return: 是否检测到验证码
     """
+    waiter = waiter or AdaptiveWaiter(driver)
     try:
         # 更精确的验证码检测 - 只检测真正的验证框特征
         has_verification = False
@@ -515,7 +608,7 @@ def detect_and_wait_for_verification(driver, page_name="当前页面"):
                 
                 if not still_has_verification:
                     print(f"    ✓ 验证完成！继续爬取...")
-                    time.sleep(2)  # 等待页面稳定
+                    waiter.wait_page_settled(timeout=5)  # 等待页面稳定
                     return True
                 else:
                     print(f"    ⏳ 仍在等待验证... ({elapsed}秒)")
@@ -540,9 +633,14 @@ def crawl_direct_product():
             url = 'https:' + SHOP_URL
         else:
             url = SHOP_URL
+        
+        # 断点续爬：该商品已完成则不再重复爬取
+        if checkpoint.is_product_done(url):
+            print(f"该商品已爬取完成，跳过")
+            return True
             
         driver.get(url)
-        time.sleep(5)
+        waiter.wait_page_settled(timeout=10)
         
         print(f"页面加载完成")
         
@@ -553,62 +651,193 @@ def crawl_direct_product():
         
         print(f"[1] {title}")
         
-        # 写入商品基本信息
-        wb.cell(row=count, column=1, value=count-1)
-        wb.cell(row=count, column=2, value=title)
-        wb.cell(row=count, column=8, value=url)
+        # 记录开始爬取该商品及各Sheet当前行数，中断后续爬时回滚到这里
+        checkpoint.start_product(url, count - 1, pageStart, sink.row_counts)
+        
+        # 写入商品基本信息（仅序号、标题、商品链接）
+        sink.append('商品列表', [count-1, title, None, None, None, None, None, url, None, None])
         
         product_num = count - 1
         count += 1
+        review_total = 0
         
         # 如果启用了评论爬取
         if CRAWL_REVIEWS:
             print(f"  └─ 开始爬取商品评论...")
             reviews = get_product_reviews(url, title, product_num)
+            if reviews is None:
+                # 评论爬取失败：不记入断点，续爬时回滚已写入的商品行并重新爬取
+                print(f"  └─ 该商品评论爬取失败，续爬时将重新爬取\n")
+                return False
             
             # 将评论写入评论Sheet
             for review in reviews:
-                wb_review.cell(row=review_count, column=1, value=review['product_num'])
-                wb_review.cell(row=review_count, column=2, value=title[:50])
-                wb_review.cell(row=review_count, column=3, value=review['username'])
-                wb_review.cell(row=review_count, column=4, value=review['purchase_info'])   # 购买记录（含时间）
-                wb_review.cell(row=review_count, column=5, value=review['content'])         # 评论内容
+                sink.append('商品评论', [review['product_num'], title[:50], review['username'],
+                                     review['purchase_info'], review['content']])   # 购买记录含时间
                 review_count += 1
+            review_total = len(reviews)
             
             print(f"  └─ 该商品评论已保存 ({len(reviews)}条)\n")
+        
+        # 商品及评论已全部写入：刷盘后记录到断点
+        sink.flush()
+        checkpoint.finish_product(url, product_num, pageStart, review_total)
+        return True
             
     except Exception as exc:
         print(f"crawl_direct_product函数错误！Error：{exc}")
+        return False
 
-# 爬虫main函数
+# 爬虫main函数（全部页码爬取完成时返回True）
 def Crawer_main():
     try:
         # 判断是否是指定商品模式
         if SHOP_URL:
-            crawl_direct_product()
+            if crawl_direct_product():
+                checkpoint.finish_page(pageStart)
         else:
+            # 断点续爬时从第一个未完成的页码开始，否则即为pageStart
+            first_page = checkpoint.next_page(pageStart, pageEnd)
+            if first_page is None:
+                print("断点中记录的页码均已爬取完成")
+                return True
             # 搜索KEYWORD
             search_goods()
-            # 判断pageStart是否为第1页
-            if pageStart != 1:
-                turn_pageStart()
-            # 爬取PageStart的商品信息
-            get_goods(pageStart)
-            # 从PageStart+1爬取到PageEnd
-            for i in range(pageStart + 1, pageEnd+1):
+            # 判断起始页是否为第1页
+            if first_page != 1:
+                turn_pageStart(first_page)
+            # 爬取起始页的商品信息
+            if get_goods(first_page):
+                checkpoint.finish_page(first_page)
+            # 从起始页+1爬取到PageEnd
+            for i in range(first_page + 1, pageEnd+1):
                 page_turning(i)
-                get_goods(i)
+                if get_goods(i):
+                    checkpoint.finish_page(i)
+        return checkpoint.next_page(pageStart, pageEnd) is None
     except Exception as exc:
         print("Crawer_main函数错误！Error：{}".format(exc))
+        return False
+
+# 解析一条评论记录（由评论增量提取返回的结构化字段），商家回复块返回None
+def parse_review_record(record):
+    """
+    :param record: {'text': 整块文本, 'username', 'content', 'time', 'purchase': 各字段选择器提取结果}
+    :return: (用户名, 评论内容, 评论时间, 购买记录)；商家回复块返回None
+    """
+    # 首先检查是否是商家回复（需要跳过）
+    seller_reply_indicators = [
+        '卖家回复', '店家回复', '商家回复', '掌柜回复',
+        'seller', 'reply', 'shopReply', '回复内容'
+    ]
+    
+    # 检查整个item的文本
+    item_text = record['text']
+    
+    # 如果这是一个纯粹的商家回复块（不包含买家评论）
+    for indicator in seller_reply_indicators:
+        if indicator in item_text:
+            # 进一步检查：是否有买家评论内容
+            # 如果整个块主要是商家回复，跳过
+            if item_text.startswith(indicator) or len(item_text) < 20:
+                return None
+    
+    # 用户名、评论内容、评论时间、购买记录（规格信息）已在浏览器端按选择器优先级提取
+    username = record['username'] or "匿名用户"
+    content = record['content']
+    review_time = record['time']
+    purchase_info = record['purchase']
+    
+    # 如果没找到规格，尝试更智能的提取方法
+    if not purchase_info:
+        try:
+            lines = item_text.split('\n')
+            
+            # 方法1：寻找包含常见规格关键词的行
+            for line in lines:
+                line = line.strip()
+                # 排除商家回复内容
+                if any(word in line for word in ['卖家回复', '店家回复', '商家回复', '掌柜回复']):
+                    continue
+                # 排除用户名和评论内容
+                if line == username or line == content:
+                    continue
+                # 检查规格关键词
+                if any(keyword in line for keyword in ['颜色', '尺码', 'GB', '版本', '规格', '套餐', '型号', 
+                                                         '内存', '存储', '配置', 'RAM', '官方', '标配']):
+                    purchase_info = line
+                    break
+            
+            # 方法2：如果还没找到，寻找日期格式（如"2025年9月20日"）
+            if not purchase_info:
+                for line in lines:
+                    line = line.strip()
+                    # 匹配日期格式
+                    if re.search(r'\d{4}年\d{1,2}月\d{1,2}日', line) or re.search(r'\d{4}-\d{2}-\d{2}', line):
+                        # 排除商家回复
+                        if not any(word in line for word in ['卖家回复', '店家回复']):
+                            purchase_info = line
+                            break
+            
+            # 方法3：如果还没找到，尝试找包含"/"或"·"分隔符的行（常见规格格式）
+            if not purchase_info:
+                for line in lines:
+                    line = line.strip()
+                    # 跳过太短或太长的行
+                    if len(line) < 5 or len(line) > 150:
+                        continue
+                    # 排除用户名、评论内容、商家回复
+                    if line == username or line == content:
+                        continue
+                    if any(word in line for word in ['卖家回复', '店家回复']):
+                        continue
+                    # 包含分隔符且不是评论内容
+                    if ('/' in line or '·' in line) and not any(word in line for word in ['很', '非常', '不错', '好', '差']):
+                        purchase_info = line
+                        break
+        except:
+            pass
+    
+    # 过滤购买记录中的商家回复内容
+    if purchase_info:
+        # 如果购买记录中包含商家回复关键词，尝试清理
+        for reply_word in ['卖家回复', '店家回复', '商家回复', '掌柜回复']:
+            if reply_word in purchase_info:
+                # 尝试分割并只保留第一部分（买家信息）
+                parts = purchase_info.split(reply_word)
+                if parts[0].strip():
+                    purchase_info = parts[0].strip()
+                else:
+                    purchase_info = ""  # 清空，因为可能全是商家回复
+                break
+    
+    # 合并日期和规格信息（如：2025年9月9日 · 幻夜黑 / 官方标配 / 6GB+128GB）
+    # 检查购买记录是否已经包含日期（避免重复）
+    has_date_in_purchase = False
+    if purchase_info:
+        has_date_in_purchase = bool(re.search(r'\d{4}年\d{1,2}月\d{1,2}日', purchase_info))
+    
+    if review_time and purchase_info and not has_date_in_purchase:
+        # 购买记录中没有日期，需要合并
+        purchase_info = f"{review_time} · {purchase_info}"
+    elif review_time and not purchase_info:
+        # 只有时间，没有规格
+        purchase_info = review_time
+    # 如果购买记录已包含日期，保持原样
+    
+    return username, content, review_time, purchase_info
 
 # 爬取商品评论（滚动加载全部）
-def get_product_reviews(product_url, product_title, product_num):
+# driver/waiter默认使用主浏览器，并发爬取时传入各工作线程自己的浏览器
+def get_product_reviews(product_url, product_title, product_num, driver=driver, waiter=waiter):
     """
     打开商品详情页，滚动加载并爬取所有评论
     :param product_url: 商品详情页链接
     :param product_title: 商品标题（用于显示）
     :param product_num: 商品序号（用于关联）
-    :return: 评论列表
+    :param driver: 使用的浏览器
+    :param waiter: 该浏览器的自适应等待
+    :return: 评论列表；爬取失败（详情页未打开或爬取中出错）时返回None，调用方不应把该商品记为已完成
     """
     reviews = []
     main_window = None
@@ -629,24 +858,25 @@ def get_product_reviews(product_url, product_title, product_num):
         main_window = driver.current_window_handle
         
         # 在新标签页打开商品详情页
+        handles_before = driver.window_handles
         driver.execute_script(f"window.open('{product_url}', '_blank');")
-        time.sleep(3)  # 等待新标签页打开
+        waiter.wait_new_window(handles_before, timeout=10)  # 等待新标签页打开
         
         # 切换到新标签页
         all_windows = driver.window_handles
         if len(all_windows) <= 1:
             print(f"    ↳ 错误：新标签页未打开，跳过该商品")
-            return reviews
+            return None
             
         for window in all_windows:
             if window != main_window:
                 driver.switch_to.window(window)
                 break
         
-        time.sleep(3)  # 等待页面加载
+        waiter.wait_page_settled(timeout=10)  # 等待页面加载
         
         # 检测是否出现验证码
-        verification_detected = detect_and_wait_for_verification(driver, "商品详情页")
+        verification_detected = detect_and_wait_for_verification(driver, "商品详情页", waiter)
         
         # 关闭可能出现的弹窗
         print(f"    ↳ 尝试关闭弹窗...")
@@ -665,7 +895,7 @@ def get_product_reviews(product_url, product_title, product_num):
                         try:
                             if btn.is_displayed():
                                 btn.click()
-                                time.sleep(0.5)
+                                waiter.wait_page_settled(timeout=1, quiet=0.2)
                                 print(f"    ↳ 已关闭一个弹窗")
                         except:
                             pass
@@ -678,7 +908,7 @@ def get_product_reviews(product_url, product_title, product_num):
         print(f"    ↳ 滚动到评论区域...")
         for i in range(6):  # 滚动6次，确保滚到评论位置
             driver.execute_script(f"window.scrollTo(0, {(i+1) * 600});")
-            time.sleep(1.5)
+            waiter.wait_page_settled(timeout=1.5, quiet=0.3)
         
         # 寻找并点击"查看全部评价"按钮
         print(f"    ↳ 寻找'查看全部评价'按钮...")
@@ -695,9 +925,9 @@ def get_product_reviews(product_url, product_title, product_num):
                             if btn.is_displayed():
                                 # 滚动到按钮位置
                                 driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                                time.sleep(1)
+                                waiter.wait_page_settled(timeout=1, quiet=0.3)
                                 btn.click()
-                                time.sleep(3)
+                                waiter.wait_page_settled(timeout=3)
                                 print(f"    ↳ 已点击'{text}'按钮")
                                 review_button_found = True
                                 break
@@ -723,9 +953,9 @@ def get_product_reviews(product_url, product_title, product_num):
                                 try:
                                     if btn.is_displayed():
                                         driver.execute_script("arguments[0].scrollIntoView({block: 'center'});", btn)
-                                        time.sleep(1)
+                                        waiter.wait_page_settled(timeout=1, quiet=0.3)
                                         btn.click()
-                                        time.sleep(3)
+                                        waiter.wait_page_settled(timeout=3)
                                         print(f"    ↳ 已点击评价按钮（通过类名）")
                                         review_button_found = True
                                         break
@@ -743,11 +973,11 @@ def get_product_reviews(product_url, product_title, product_num):
             print(f"    ↳ 未找到'查看全部评价'按钮，尝试直接提取当前页面评论")
         
         # 检测是否出现验证码（点击评论按钮后）
-        time.sleep(2)
-        detect_and_wait_for_verification(driver, "评论页面")
+        waiter.wait_page_settled(timeout=2)
+        detect_and_wait_for_verification(driver, "评论页面", waiter)
         
         # 检查是否打开了新页面/标签
-        time.sleep(2)
+        waiter.wait_page_settled(timeout=2)
         current_windows = driver.window_handles
         if len(current_windows) > len([main_window]):
             # 打开了新标签页，切换过去
@@ -755,7 +985,7 @@ def get_product_reviews(product_url, product_title, product_num):
                 if window != main_window and window != driver.current_window_handle:
                     driver.switch_to.window(window)
                     print(f"    ↳ 检测到新标签页，已切换")
-                    time.sleep(2)
+                    waiter.wait_page_settled(timeout=5)
                     break
         
         # 寻找评论容器（可能是弹窗、侧边栏等）
@@ -799,7 +1029,7 @@ def get_product_reviews(product_url, product_title, product_num):
                         try:
                             if btn.is_displayed():
                                 btn.click()
-                                time.sleep(2)
+                                waiter.wait_page_settled(timeout=2)
                                 print(f"    ↳ 已点击'{text}'按钮")
                         except:
                             pass
@@ -808,6 +1038,71 @@ def get_product_reviews(product_url, product_title, product_num):
         except:
             pass
         
+        # 评论增量提取：每次滚动后只提取新出现的评论节点，边滚动边解析、去重
+        harvester = ReviewHarvester(driver)
+        
+        # 评论去重集合（使用内容hash）
+        seen_reviews = set()
+        extracted_reviews = []
+        skipped_seller_replies = 0
+        skipped_duplicates = 0
+        missing_purchase_samples = []  # 保存缺失购买记录的样本
+        
+        def harvest_new_reviews():
+            """提取并解析新加载的评论，去重后追加到extracted_reviews"""
+            nonlocal skipped_seller_replies, skipped_duplicates
+            # 只在还需要调试样本时才让浏览器返回评论节点HTML
+            records = harvester.harvest(want_html=len(missing_purchase_samples) < 5)
+            for record in records:
+                try:
+                    parsed = parse_review_record(record)
+                    if parsed is None:
+                        skipped_seller_replies += 1
+                        continue
+                    username, content, review_time, purchase_info = parsed
+                    
+                    if content:  # 只保存有内容的评论
+                        # 去重检查（基于内容+用户名）
+                        review_hash = hash(f"{username}|{content}")
+                        if review_hash in seen_reviews:
+                            skipped_duplicates += 1
+                            continue
+                        seen_reviews.add(review_hash)
+                        
+                        # 如果没有购买记录，保存前5条样本HTML用于调试
+                        if not purchase_info and len(missing_purchase_samples) < 5:
+                            sample_data = {
+                                'index': len(extracted_reviews) + 1,
+                                'username': username,
+                                'content': content[:50],
+                                'html': record.get('html', ''),
+                                'text': record['text']
+                            }
+                            missing_purchase_samples.append(sample_data)
+                        
+                        # 保存评论
+                        review_data = {
+                            'product_num': product_num,
+                            'username': username.strip(),
+                            'content': content.strip(),
+                            'purchase_info': purchase_info.strip(),
+                            'time': review_time.strip()
+                        }
+                        extracted_reviews.append(review_data)
+                        
+                        # 显示简要信息（调试模式显示更多信息）
+                        if purchase_info or review_time:
+                            info_display = f" | 购买: {purchase_info[:30] if purchase_info else '无'}"
+                        else:
+                            info_display = " | ⚠️未提取到购买记录"
+                        
+                        if len(extracted_reviews) <= 3 or len(extracted_reviews) % 100 == 0:  # 前3条和每100条显示一次
+                            print(f"        [{len(extracted_reviews)}] {username}: {content[:30]}...{info_display}")
+                        
+                except Exception as e:
+                    # 单条评论提取失败不影响其他评论
+                    continue
+        
         # 滚动加载所有评论（优化滚动策略）
         print(f"    ↳ 开始滚动加载所有评论...")
         scroll_attempts = 0
@@ -818,13 +1113,16 @@ def get_product_reviews(product_url, product_title, product_num):
         if review_container:
             # 滚动评论容器
             print(f"    ↳ 滚动评论容器（左侧面板）...")
-            last_height = driver.execute_script("return arguments[0].scrollHeight;", review_container)
+            state = waiter.snapshot(review_container, REVIEW_ITEM_SELECTOR)
+            last_height = state['height']
             last_review_count = 0
+            waiter.reset()
             
             while scroll_attempts < max_scrolls:
-                # 滚动容器到底部
+                # 滚动容器到底部，等待新评论加载（有新内容立即继续，无变化时自适应退避）
                 driver.execute_script("arguments[0].scrollTop = arguments[0].scrollHeight;", review_container)
-                time.sleep(1.5)  # 优化等待时间
+                _, state = waiter.wait_for_growth(state, review_container, REVIEW_ITEM_SELECTOR)
+                harvest_new_reviews()  # 只提取本次滚动新加载的评论
                 
                 # 每滚动15次，尝试点击"加载更多"按钮
                 if scroll_attempts % 15 == 0 and scroll_attempts > 0:
@@ -834,17 +1132,16 @@ def get_product_reviews(product_url, product_title, product_num):
                             try:
                                 if btn.is_displayed():
                                     btn.click()
-                                    time.sleep(1)
+                                    waiter.wait_page_settled(timeout=2)
+                                    state = waiter.snapshot(review_container, REVIEW_ITEM_SELECTOR)
                             except:
                                 pass
                     except:
                         pass
                 
-                # 计算新的滚动高度
-                new_height = driver.execute_script("return arguments[0].scrollHeight;", review_container)
-                
-                # 获取当前评论数量（用于显示进度和判断）
-                current_reviews = len(driver.find_elements(By.CSS_SELECTOR, 'div.Comment--H5QmJwe9, div[class*="Comment--"]'))
+                # 新的滚动高度和当前评论数量（用于显示进度和判断）
+                new_height = state['height']
+                current_reviews = state['items']
                 
                 # 检查评论数量是否增加
                 if current_reviews > last_review_count:
@@ -853,13 +1150,13 @@ def get_product_reviews(product_url, product_title, product_num):
                 else:
                     no_new_reviews_count += 1
                 
-                # 如果高度没变且评论数量没变，连续10次才停止
+                # 如果高度没变且评论数量没变，连续STALE_ROUNDS轮才停止
                 if new_height == last_height:
                     unchanged_count += 1
-                    if unchanged_count >= 8 and no_new_reviews_count >= 8:
+                    if unchanged_count >= STALE_ROUNDS and no_new_reviews_count >= STALE_ROUNDS:
                         print(f"    ↳ 容器已滚动到底部（高度和评论数连续未变化，共{current_reviews}条）")
                         break
-                    elif unchanged_count >= 8:
+                    elif unchanged_count >= STALE_ROUNDS:
                         print(f"    ↳ 高度未变化（{unchanged_count}次），但可能还有评论，继续...")
                 else:
                     unchanged_count = 0
@@ -870,16 +1167,19 @@ def get_product_reviews(product_url, product_title, product_num):
                     print(f"    ↳ 第{scroll_attempts}次滚动，已加载 {current_reviews} 条评论...")
                     # 每滚动50次检测一次验证码（降低检测频率）
                     if scroll_attempts % 50 == 0:
-                        detect_and_wait_for_verification(driver, "评论滚动中")
+                        detect_and_wait_for_verification(driver, "评论滚动中", waiter)
         else:
             # 没找到容器，滚动整个页面
             print(f"    ↳ 未找到评论容器，滚动整个页面...")
-            last_height = driver.execute_script("return document.body.scrollHeight")
+            state = waiter.snapshot(selector=REVIEW_ITEM_SELECTOR)
+            last_height = state['height']
             last_review_count = 0
+            waiter.reset()
             
             while scroll_attempts < max_scrolls:
                 driver.execute_script("window.scrollTo(0, document.body.scrollHeight);")
-                time.sleep(1.5)
+                _, state = waiter.wait_for_growth(state, selector=REVIEW_ITEM_SELECTOR)
+                harvest_new_reviews()  # 只提取本次滚动新加载的评论
                 
                 # 每滚动15次，尝试点击"加载更多"按钮
                 if scroll_attempts % 15 == 0 and scroll_attempts > 0:
@@ -889,14 +1189,15 @@ def get_product_reviews(product_url, product_title, product_num):
                             try:
                                 if btn.is_displayed():
                                     btn.click()
-                                    time.sleep(1)
+                                    waiter.wait_page_settled(timeout=2)
+                                    state = waiter.snapshot(selector=REVIEW_ITEM_SELECTOR)
                             except:
                                 pass
                     except:
                         pass
                 
-                new_height = driver.execute_script("return document.body.scrollHeight")
-                current_reviews = len(driver.find_elements(By.CSS_SELECTOR, 'div.Comment--H5QmJwe9, div[class*="Comment--"]'))
+                new_height = state['height']
+                current_reviews = state['items']
                 
                 # 检查评论数量是否增加
                 if current_reviews > last_review_count:
@@ -907,10 +1208,10 @@ def get_product_reviews(product_url, product_title, product_num):
                 
                 if new_height == last_height:
                     unchanged_count += 1
-                    if unchanged_count >= 8 and no_new_reviews_count >= 8:
+                    if unchanged_count >= STALE_ROUNDS and no_new_reviews_count >= STALE_ROUNDS:
                         print(f"    ↳ 已滚动到底部（高度和评论数连续未变化，共{current_reviews}条）")
                         break
-                    elif unchanged_count >= 8:
+                    elif unchanged_count >= STALE_ROUNDS:
                         print(f"    ↳ 高度未变化（{unchanged_count}次），但可能还有评论，继续...")
                 else:
                     unchanged_count = 0
@@ -921,275 +1222,23 @@ def get_product_reviews(product_url, product_title, product_num):
                     print(f"    ↳ 第{scroll_attempts}次滚动，已加载 {current_reviews} 条评论...")
                     # 每滚动50次检测一次验证码（降低检测频率）
                     if scroll_attempts % 50 == 0:
-                        detect_and_wait_for_verification(driver, "评论滚动中")
+                        detect_and_wait_for_verification(driver, "评论滚动中", waiter)
         
-        # 提取评论信息
-        print(f"    ↳ 正在提取评论...")
-        html = driver.page_source
-        doc = pq(html)
-        
-        # 淘宝/天猫评论的常见选择器（按优先级排序）
-        review_selectors = [
-            'div.Comment--H5QmJwe9',  # 新版淘宝评论项
-            'div[class*="Comment--"]',  # 模糊匹配评论项
-            'div.rate-grid',  # 旧版淘宝评论容器
-            'div.J_KgRate_ReviewItem',  # 天猫评论
-            'div.rate-item',  # 评论项
-            'div.commentItem',  # 通用评论项
-            'div[class*="comment"]',  # 模糊匹配包含comment的类
-        ]
+        # 提取最后一次滚动后新出现的评论
+        print(f"    ↳ 正在提取剩余评论...")
+        harvest_new_reviews()
         
-        review_items = []
-        used_selector = None
-        for selector in review_selectors:
-            review_items = list(doc(selector).items())
-            if len(review_items) > 0:
-                used_selector = selector
-                print(f"    ↳ 使用选择器 '{selector}' 找到 {len(review_items)} 条评论")
-                break
-        
-        if len(review_items) == 0:
+        if harvester.total == 0:
             print(f"    ↳ ⚠️ 警告：未找到评论元素，可能页面结构已变化")
             # 保存页面HTML用于调试（仅在没找到评论时）
             debug_file = f'debug_product_{product_num}.html'
             with open(debug_file, 'w', encoding='utf-8') as f:
-                f.write(html)
+                f.write(driver.page_source)
             print(f"    ↳ 已保存页面HTML到 {debug_file}")
             print(f"    ↳ 可以打开此文件，搜索评论文本，查看实际的HTML结构")
             print(f"    ↳ 如果看到评论，请将评论元素的class名称反馈，以便更新选择器")
-        
-        # 评论去重集合（使用内容hash）
-        seen_reviews = set()
-        extracted_reviews = []
-        skipped_seller_replies = 0
-        skipped_duplicates = 0
-        missing_purchase_samples = []  # 保存缺失购买记录的样本
-        
-        # 提取评论内容（支持多种HTML结构）
-        for idx, item in enumerate(review_items):
-            try:
-                # 首先检查是否是商家回复（需要跳过）
-                item_html = item.html()
-                seller_reply_indicators = [
-                    '卖家回复', '店家回复', '商家回复', '掌柜回复',
-                    'seller', 'reply', 'shopReply', '回复内容'
-                ]
-                
-                # 检查整个item的文本
-                item_text = item.text()
-                is_seller_reply = False
-                
-                # 如果这是一个纯粹的商家回复块（不包含买家评论）
-                for indicator in seller_reply_indicators:
-                    if indicator in item_text:
-                        # 进一步检查：是否有买家评论内容
-                        # 如果整个块主要是商家回复，跳过
-                        if item_text.startswith(indicator) or len(item_text) < 20:
-                            is_seller_reply = True
-                            break
-                
-                if is_seller_reply:
-                    skipped_seller_replies += 1
-                    continue
-                
-                # 提取评论用户名（多种可能的选择器）
-                username_selectors = [
-                    '.userNick--L1gNFN4c',  # 新版淘宝
-                    '.header--nYbpA78v .username',
-                    '.rate-user-info',
-                    '.tb-rate-user',
-                    '.user-name',
-                    'div[class*="userNick"]',
-                    'div[class*="username"]',
-                    'span[class*="user"]'
-                ]
-                username = "匿名用户"
-                for selector in username_selectors:
-                    username_elem = item.find(selector).text()
-                    if username_elem and username_elem.strip():
-                        username = username_elem.strip()
-                        break
-                
-                # 提取评论内容（多种可能的选择器）
-                content_selectors = [
-                    '.content--wJnWgVVD',  # 新版淘宝
-                    '.reviewDetail--BmRBV0Aq',
-                    '.rate-content',
-                    '.J_KgRate_ReviewContent',
-                    '.comment-content',
-                    'div[class*="content"]',
-                    'div[class*="reviewDetail"]'
-                ]
-                content = ""
-                for selector in content_selectors:
-                    content_elem = item.find(selector).text()
-                    if content_elem and content_elem.strip():
-                        content = content_elem.strip()
-                        break
-                
-                # 提取评论时间（扩展选择器）
-                time_selectors = [
-                    '.date--kEq7WUd3',  # 新版淘宝
-                    '.time--xmsIQ6o3',  # 新版淘宝时间
-                    '.rate-date',
-                    '.tm-rate-date',
-                    '.comment-time',
-                    'span[class*="date"]',
-                    'span[class*="time"]',
-                    'div[class*="date"]',
-                    'div[class*="time"]',
-                    '.header--nYbpA78v span:last-child',  # 头部最后一个span可能是时间
-                ]
-                review_time = ""
-                for selector in time_selectors:
-                    time_elem = item.find(selector).text()
-                    if time_elem and time_elem.strip():
-                        review_time = time_elem.strip()
-                        break
-                
-                # 提取购买记录（规格信息）- 扩展选择器
-                purchase_selectors = [
-                    '.meta--PLijz6qf',  # ✅ 新版淘宝购买记录（包含时间+规格）- 最优先！
-                    '.attribute--wPXM_ggZ',  # 新版淘宝
-                    '.subInfo--Y53eXpAX',  # 新版淘宝子信息
-                    '.text--YbMC04EH',  # 规格文本
-                    'div[class*="meta--"]',  # 模糊匹配meta类
-                    '.rate-sku',
-                    '.sku-info',
-                    '.tm-rate-sku',
-                    '.rate-append-sku',
-                    'div[class*="attribute"]',
-                    'div[class*="sku"]',
-                    'div[class*="subInfo"]',
-                    'div[class*="text--"]',
-                    'span[class*="sku"]',
-                ]
-                purchase_info = ""
-                for selector in purchase_selectors:
-                    sku_elem = item.find(selector).text()
-                    if sku_elem and sku_elem.strip():
-                        purchase_info = sku_elem.strip()
-                        break
-                
-                # 如果没找到规格，尝试更智能的提取方法
-                if not purchase_info:
-                    try:
-                        all_text = item.text()
-                        lines = all_text.split('\n')
-                        
-                        # 方法1：寻找包含常见规格关键词的行
-                        for line in lines:
-                            line = line.strip()
-                            # 排除商家回复内容
-                            if any(word in line for word in ['卖家回复', '店家回复', '商家回复', '掌柜回复']):
-                                continue
-                            # 排除用户名和评论内容
-                            if line == username or line == content:
-                                continue
-                            # 检查规格关键词
-                            if any(keyword in line for keyword in ['颜色', '尺码', 'GB', '版本', '规格', '套餐', '型号', 
-                                                                     '内存', '存储', '配置', 'RAM', '官方', '标配']):
-                                purchase_info = line
-                                break
-                        
-                        # 方法2：如果还没找到，寻找日期格式（如"2025年9月20日"）
-                        if not purchase_info:
-                            for line in lines:
-                                line = line.strip()
-                                # 匹配日期格式
-                                if re.search(r'\d{4}年\d{1,2}月\d{1,2}日', line) or re.search(r'\d{4}-\d{2}-\d{2}', line):
-                                    # 排除商家回复
-                                    if not any(word in line for word in ['卖家回复', '店家回复']):
-                                        purchase_info = line
-                                        break
-                        
-                        # 方法3：如果还没找到，尝试找包含"/"或"·"分隔符的行（常见规格格式）
-                        if not purchase_info:
-                            for line in lines:
-                                line = line.strip()
-                                # 跳过太短或太长的行
-                                if len(line) < 5 or len(line) > 150:
-                                    continue
-                                # 排除用户名、评论内容、商家回复
-                                if line == username or line == content:
-                                    continue
-                                if any(word in line for word in ['卖家回复', '店家回复']):
-                                    continue
-                                # 包含分隔符且不是评论内容
-                                if ('/' in line or '·' in line) and not any(word in line for word in ['很', '非常', '不错', '好', '差']):
-                                    purchase_info = line
-                                    break
-                    except:
-                        pass
-                
-                # 过滤购买记录中的商家回复内容
-                if purchase_info:
-                    # 如果购买记录中包含商家回复关键词，尝试清理
-                    for reply_word in ['卖家回复', '店家回复', '商家回复', '掌柜回复']:
-                        if reply_word in purchase_info:
-                            # 尝试分割并只保留第一部分（买家信息）
-                            parts = purchase_info.split(reply_word)
-                            if parts[0].strip():
-                                purchase_info = parts[0].strip()
-                            else:
-                                purchase_info = ""  # 清空，因为可能全是商家回复
-                            break
-                
-                # 合并日期和规格信息（如：2025年9月9日 · 幻夜黑 / 官方标配 / 6GB+128GB）
-                # 检查购买记录是否已经包含日期（避免重复）
-                has_date_in_purchase = False
-                if purchase_info:
-                    has_date_in_purchase = bool(re.search(r'\d{4}年\d{1,2}月\d{1,2}日', purchase_info))
-                
-                if review_time and purchase_info and not has_date_in_purchase:
-                    # 购买记录中没有日期，需要合并
-                    purchase_info = f"{review_time} · {purchase_info}"
-                elif review_time and not purchase_info:
-                    # 只有时间，没有规格
-                    purchase_info = review_time
-                # 如果购买记录已包含日期，保持原样
-                
-                if content:  # 只保存有内容的评论
-                    # 去重检查（基于内容+用户名）
-                    review_hash = hash(f"{username}|{content}")
-                    if review_hash in seen_reviews:
-                        skipped_duplicates += 1
-                        continue
-                    seen_reviews.add(review_hash)
-                    
-                    # 如果没有购买记录，保存前5条样本HTML用于调试
-                    if not purchase_info and len(missing_purchase_samples) < 5:
-                        sample_data = {
-                            'index': len(extracted_reviews) + 1,
-                            'username': username,
-                            'content': content[:50],
-                            'html': item.html(),
-                            'text': item.text()
-                        }
-                        missing_purchase_samples.append(sample_data)
-                    
-                    # 保存评论
-                    review_data = {
-                        'product_num': product_num,
-                        'username': username.strip(),
-                        'content': content.strip(),
-                        'purchase_info': purchase_info.strip(),
-                        'time': review_time.strip()
-                    }
-                    extracted_reviews.append(review_data)
-                    
-                    # 显示简要信息（调试模式显示更多信息）
-                    if purchase_info or review_time:
-                        info_display = f" | 购买: {purchase_info[:30] if purchase_info else '无'}"
-                    else:
-                        info_display = " | ⚠️未提取到购买记录"
-                    
-                    if len(extracted_reviews) <= 3 or len(extracted_reviews) % 100 == 0:  # 前3条和每100条显示一次
-                        print(f"        [{len(extracted_reviews)}] {username}: {content[:30]}...{info_display}")
-                    
-            except Exception as e:
-                # 单条评论提取失败不影响其他评论
-                continue
+        else:
+            print(f"    ↳ 使用选择器 '{harvester.selector}' 共找到 {harvester.total} 条评论")
         
         # 将去重后的评论赋值给reviews
         reviews = extracted_reviews
@@ -1227,6 +1276,7 @@ def get_product_reviews(product_url, product_title, product_num):
         print(f"    ↳ 爬取评论失败：{exc}")
         print(f"    ↳ 商品链接：{product_url}")
         print(f"    ↳ 跳过该商品的评论采集")
+        reviews = None
     
     finally:
         # 关闭详情页标签和评论页标签，返回搜索列表页
@@ -1244,58 +1294,119 @@ def get_product_reviews(product_url, product_title, product_num):
                 
                 # 切回主窗口
                 driver.switch_to.window(main_window)
-                time.sleep(1)
+                waiter.wait_page_settled(timeout=1, quiet=0.2)
                 print(f"    ↳ 已返回搜索列表页\n")
         except Exception as e:
             print(f"    ↳ 返回主窗口失败：{e}")
     
     return reviews
 
+# 并发爬取评论：为工作线程启动一个浏览器，并复制主浏览器的登录状态（Cookie）
+def create_review_session(index):
+    print(f"正在启动评论浏览器 {index + 1}/{REVIEW_WORKERS}...")
+    browser = webdriver.Chrome(service=Service(service.path), options=options)
+    browser.execute_cdp_cmd("Page.addScriptToEvaluateOnNewDocument",
+                            {"source": """Object.defineProperty(navigator, 'webdriver', {get: () => undefined})"""})
+    browser.get('https://www.taobao.com/')
+    for cookie in driver.get_cookies():
+        try:
+            browser.add_cookie(cookie)
+        except Exception:
+            pass
+    browser.refresh()
+    return browser, AdaptiveWaiter(browser)
+
+# 在工作线程的浏览器中爬取一个商品的评论
+def crawl_reviews_in_session(session, product_url, product_title, product_num):
+    browser, browser_waiter = session
+    print(f"  └─ 商品{product_num}：开始爬取商品评论...")
+    return get_product_reviews(product_url, product_title, product_num, browser, browser_waiter)
+
+def close_review_session(session):
+    session[0].quit()
+
 if __name__ == '__main__':
-    # 建立Excel表格
+    # 建立结果写入器：每爬到一行就追加写入日志文件并定期刷盘，结束时再生成输出文件
     try:
-        ws = op.Workbook()                                  # 创建Workbook
-        wb = ws.create_sheet(index=0, title='商品列表')      # 创建商品列表worksheet
-        # Excel第一行：表头
+        if RESUME:
+            # 续爬时沿用原来的输出文件名，在原有日志后继续追加
+            output_base = checkpoint.output_base
+        else:
+            data = time.strftime('%Y%m%d-%H%M', time.localtime(time.time()))
+            output_base = "{}_{}_FromTB".format(KEYWORD, data)
+        # 商品列表表头
         title_list = ['Num', 'title', 'Price', 'Deal', 'Location', 'Shop', 'IsPostFree', 'Title_URL',
                       'Shop_URL', 'Img_URL']
-        for i in range(0, len(title_list)):
-            wb.cell(row=count, column=i + 1, value=title_list[i])
-        count += 1  # 从第二行开始写爬取数据
+        sheets = {'商品列表': title_list}
+        count += 1  # 第一行为表头，从第二行开始写爬取数据
         
         # 如果启用评论爬取，创建评论Sheet
         if CRAWL_REVIEWS:
-            wb_review = ws.create_sheet(index=1, title='商品评论')  # 创建评论worksheet
             review_title_list = ['商品序号', '商品标题', '用户名', '购买记录', '评论内容']
-            for i in range(0, len(review_title_list)):
-                wb_review.cell(row=review_count, column=i + 1, value=review_title_list[i])
+            sheets['商品评论'] = review_title_list
             review_count += 1  # 从第二行开始写评论数据
             print(f"\n已启用评论爬取功能！评论将保存到单独的Sheet中。\n")
             print(f"注意：购买记录列包含时间和规格信息（如：2025年9月20日 · 星空蓝 / 12GB+256GB）\n")
         else:
-            wb_review = None  # 不爬取评论时设为None
             print(f"\n未启用评论爬取，仅爬取商品基本信息。\n")
+        
+        sink = StreamingSink(output_base, sheets, output_format=OUTPUT_FORMAT)
+        print(f"爬取数据将实时写入: {', '.join(sink.journal_path(name) for name in sheets)}\n")
+        
+        if RESUME:
+            # 回滚中断时未爬取完成的商品已写入的部分数据，该商品会重新爬取
+            if checkpoint.in_progress:
+                for name, rows in checkpoint.in_progress['offsets'].items():
+                    if name in sink.sheets:
+                        sink.truncate(name, rows)
+                checkpoint.in_progress = None
+                checkpoint.save()
+            # 商品序号和评论计数接着已写入的行数继续
+            count += sink.row_counts['商品列表']
+            if CRAWL_REVIEWS:
+                review_count += sink.row_counts['商品评论']
+        else:
+            checkpoint = CrawlCheckpoint(output_base, {
+                'SHOP_URL': SHOP_URL, 'KEYWORD': KEYWORD, 'pageStart': pageStart, 'pageEnd': pageEnd,
+                'LIMIT_PRODUCTS': LIMIT_PRODUCTS, 'CRAWL_REVIEWS': CRAWL_REVIEWS, 'REVIEW_WORKERS': REVIEW_WORKERS,
+                'OUTPUT_FORMAT': OUTPUT_FORMAT})
+            checkpoint.save()
+        print(f"爬取进度将记录到断点文件: {checkpoint.path}\n")
+        
+        # 多个浏览器并发爬取评论（启动失败时退回逐个商品爬取）
+        if CRAWL_REVIEWS and REVIEW_WORKERS > 1 and not SHOP_URL:
+            try:
+                review_pool = ReviewWorkerPool(create_review_session, crawl_reviews_in_session,
+                                               close_review_session, workers=REVIEW_WORKERS)
+                print(f"已启动 {REVIEW_WORKERS} 个评论浏览器，评论将按商品顺序写入\n")
+            except Exception as exc:
+                print(f"评论浏览器启动失败，改为逐个商品爬取：{exc}\n")
+                review_pool = None
             
     except Exception as exc:
         print("Excel建立失败！Error：{}".format(exc))
+        exit(1)
  
-    # 开始爬取数据
-    Crawer_main()
- 
-    # 删除默认创建的Sheet
+    # 开始爬取数据（中途出错或按Ctrl+C中断时，已爬取的数据同样会被保存）
+    finished = False
     try:
-        default_sheet = ws['Sheet']
-        ws.remove(default_sheet)
-    except:
-        pass
-    
-    # 保存Excel表格
-    data = time.strftime('%Y%m%d-%H%M', time.localtime(time.time()))
-    Filename = "{}_{}_FromTB.xlsx".format(KEYWORD,data)
-    ws.save(filename = Filename)
-    print("\n" + "="*60)
-    print(f"✓ 文件保存成功：{Filename}")
-    print(f"✓ 商品数量：{count - 2} 个")
-    if CRAWL_REVIEWS:
-        print(f"✓ 评论数量：{review_count - 2} 条")
-    print("="*60)
+        finished = Crawer_main()
+    except KeyboardInterrupt:
+        print("\n⚠️  爬取被中断，正在保存已爬取的数据...")
+    finally:
+        # 关闭评论浏览器（中断时未写入的商品不会记入断点，续爬时重新爬取）
+        if review_pool:
+            review_pool.close(cancel=not finished)
+        # 保存结果文件；未全部完成时保留日志和断点文件，供 --resume 继续追加
+        Filenames = sink.close(keep_journal=not finished)
+        if finished:
+            checkpoint.remove()
+        print("\n" + "="*60)
+        print(f"✓ 文件保存成功：{', '.join(Filenames)}")
+        print(f"✓ 商品数量：{count - 2} 个")
+        if CRAWL_REVIEWS:
+            print(f"✓ 评论数量：{review_count - 2} 条")
+        if not finished:
+            print(f"⚠️  爬取未全部完成，断点已保存：{checkpoint.path}")
+            print(f"   运行 python 爬虫代码.py --resume 可从断点继续")
+        print("="*60)
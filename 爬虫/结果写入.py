@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+爬取结果流式写入
+每爬到一行数据就追加写入对应Sheet的JSON Lines日志文件，并定期刷盘：
+    - 内存中不再保存整个Workbook，内存占用不随评论数量增长
+    - 程序中途崩溃或被中断时，已爬取的数据仍保存在日志文件中
+爬取结束后再把日志转换为最终输出（xlsx/csv/parquet），转换成功后删除日志文件。
+"""
+
+import csv
+import json
+import os
+
+import openpyxl as op
+
+OUTPUT_FORMATS = ('xlsx', 'csv', 'parquet')
+
+
+class StreamingSink:
+    """按行追加写入多个Sheet的结果写入器"""
+
+    def __init__(self, output_base, sheets, output_format='xlsx', flush_every=20):
+        """
+        :param output_base: 输出文件名（不含扩展名），如 "指定商品_20250930-1555_FromTB"
+        :param sheets: {Sheet名: 表头列表}，按顺序生成Sheet
+        :param output_format: 最终输出格式 xlsx / csv / parquet
+        :param flush_every: 每追加多少行刷盘一次
+        """
+        if output_format not in OUTPUT_FORMATS:
+            raise ValueError(f"不支持的输出格式: {output_format}（可选: {', '.join(OUTPUT_FORMATS)}）")
+        self.output_base = output_base
+        self.sheets = {name: list(header) for name, header in sheets.items()}
+        self.output_format = output_format
+        self.flush_every = flush_every
+        self.row_counts = {name: 0 for name in self.sheets}
+        self._pending = 0
+        self._journals = {}
+        for name in self.sheets:
+            path = self.journal_path(name)
+            # 日志已存在时（如断点续爬）在末尾追加，并接着原有行数计数
+            if os.path.exists(path):
+                with open(path, 'r', encoding='utf-8') as f:
+                    self.row_counts[name] = sum(1 for line in f if line.strip())
+            self._journals[name] = open(path, 'a', encoding='utf-8')
+
+    def journal_path(self, sheet):
+        return f"{self.output_base}.{sheet}.jsonl"
+
+    def append(self, sheet, row):
+        """追加一行数据（列顺序与表头一致）"""
+        self._journals[sheet].write(json.dumps(list(row), ensure_ascii=False) + '\n')
+        self.row_counts[sheet] += 1
+        self._pending += 1
+        if self._pending >= self.flush_every:
+            self.flush()
+
+    def flush(self):
+        """把缓冲区写入磁盘"""
+        for journal in self._journals.values():
+            journal.flush()
+            os.fsync(journal.fileno())
+        self._pending = 0
+
+    def truncate(self, sheet, rows):
+        """把Sheet回滚到只保留前rows行（断点续爬时丢弃未完成商品写入的部分数据）"""
+        if self.row_counts[sheet] <= rows:
+            return
+        self._journals[sheet].close()
+        path = self.journal_path(sheet)
+        tmp_file = path + '.tmp'
+        kept = 0
+        with open(path, 'r', encoding='utf-8') as src, open(tmp_file, 'w', encoding='utf-8') as dst:
+            for line in src:
+                if kept >= rows:
+                    break
+                if line.strip():
+                    dst.write(line)
+                    kept += 1
+        os.replace(tmp_file, path)
+        self.row_counts[sheet] = kept
+        self._journals[sheet] = open(path, 'a', encoding='utf-8')
+
+    def close(self, keep_journal=False):
+        """刷盘并把日志转换为最终输出文件，返回输出文件列表
+        :param keep_journal: 为True时导出后保留日志文件（爬取未完成，供断点续爬继续追加）
+        """
+        self.flush()
+        for journal in self._journals.values():
+            journal.close()
+
+        export = {'xlsx': self._export_xlsx, 'csv': self._export_csv, 'parquet': self._export_parquet}
+        outputs = export[self.output_format]()
+
+        if not keep_journal:
+            for name in self.sheets:
+                os.remove(self.journal_path(name))
+        return outputs
+
+    def _iter_rows(self, sheet):
+        with open(self.journal_path(sheet), 'r', encoding='utf-8') as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def _export_xlsx(self):
+        # write_only模式逐行写出，不在内存中保留单元格对象
+        wb = op.Workbook(write_only=True)
+        for name, header in self.sheets.items():
+            ws = wb.create_sheet(title=name)
+            ws.append(header)
+            for row in self._iter_rows(name):
+                ws.append(row)
+        filename = f"{self.output_base}.xlsx"
+        wb.save(filename)
+        return [filename]
+
+    def _export_csv(self):
+        outputs = []
+        for name, header in self.sheets.items():
+            filename = f"{self.output_base}_{name}.csv"
+            with open(filename, 'w', encoding='utf-8-sig', newline='') as f:
+                writer = csv.writer(f)
+                writer.writerow(header)
+                writer.writerows(self._iter_rows(name))
+            outputs.append(filename)
+        return outputs
+
+    def _export_parquet(self):
+        import pandas as pd
+        outputs = []
+        for name, header in self.sheets.items():
+            filename = f"{self.output_base}_{name}.parquet"
+            pd.DataFrame(list(self._iter_rows(name)), columns=header).to_parquet(filename, index=False)
+            outputs.append(filename)
+        return outputs
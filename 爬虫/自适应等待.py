@@ -0,0 +1,135 @@
+# -*- coding: utf-8 -*-
+"""
+自适应等待
+在WebDriverWait的基础上按页面实际状态等待，替代固定的 time.sleep：
+    - 页面稳定：readyState为complete，且一段时间内没有DOM变化、没有新的网络请求完成
+    - 内容增长：滚动后页面/容器高度变化或条目数增加就立即返回
+只有在页面没有变化时才逐步延长下一次的等待时间（指数退避），有变化后恢复最短等待。
+每次等待保留一个带随机抖动的最短间隔，操作节奏不会快于人工浏览，避免增加反爬风险。
+"""
+
+import random
+import time
+
+from selenium.common.exceptions import TimeoutException, WebDriverException
+from selenium.webdriver.support import expected_conditions as EC
+from selenium.webdriver.support.ui import WebDriverWait
+
+# 注入MutationObserver并返回页面状态快照（同一文档只注入一次）
+_PROBE_JS = """
+var container = arguments[0], selector = arguments[1];
+if (!window.__adaptiveWait) {
+    window.__adaptiveWait = {mutations: 0, last: performance.now()};
+    if (performance.setResourceTimingBufferSize) { performance.setResourceTimingBufferSize(100000); }
+    new MutationObserver(function (list) {
+        window.__adaptiveWait.mutations += list.length;
+        window.__adaptiveWait.last = performance.now();
+    }).observe(document.documentElement, {childList: true, subtree: true, characterData: true});
+}
+var state = window.__adaptiveWait;
+return {
+    height: container ? container.scrollHeight : document.body.scrollHeight,
+    items: selector ? document.querySelectorAll(selector).length : 0,
+    mutations: state.mutations,
+    idle: performance.now() - state.last,
+    resources: performance.getEntriesByType('resource').length,
+    ready: document.readyState
+};
+"""
+
+
+class AdaptiveWaiter:
+    """基于页面状态的自适应等待"""
+
+    def __init__(self, driver, min_interval=0.4, jitter=0.4, min_window=1.0, max_window=4.0, poll=0.2):
+        """
+        :param driver: WebDriver
+        :param min_interval: 两次操作之间的最短间隔（秒），有变化时也至少等待这么久
+        :param jitter: 最短间隔上叠加的随机抖动上限（秒）
+        :param min_window: 等待内容增长的初始超时（秒）
+        :param max_window: 连续无变化时超时退避的上限（秒）
+        :param poll: 轮询页面状态的间隔（秒）
+        """
+        self.driver = driver
+        self.min_interval = min_interval
+        self.jitter = jitter
+        self.min_window = min_window
+        self.max_window = max_window
+        self.poll = poll
+        self.window = min_window
+
+    def snapshot(self, container=None, selector=None):
+        """返回页面状态: 高度、条目数、DOM变化次数、距上次DOM变化的毫秒数、已完成的网络请求数、readyState"""
+        return self.driver.execute_script(_PROBE_JS, container, selector)
+
+    def _pause(self, started):
+        """保证距started至少经过 min_interval + 随机抖动"""
+        remaining = self.min_interval + random.uniform(0, self.jitter) - (time.time() - started)
+        if remaining > 0:
+            time.sleep(remaining)
+
+    def wait_page_settled(self, timeout=10, quiet=0.5):
+        """等待页面加载完成且DOM和网络请求安静quiet秒，最多等待timeout秒
+        :return: 是否在超时前稳定
+        """
+        started = time.time()
+        last = {'resources': None, 'since': started}
+
+        def settled(driver):
+            state = self.snapshot()
+            now = time.time()
+            if state['resources'] != last['resources']:
+                last['resources'], last['since'] = state['resources'], now
+            return (state['ready'] == 'complete'
+                    and state['idle'] >= quiet * 1000
+                    and now - last['since'] >= quiet)
+
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll,
+                          ignored_exceptions=(WebDriverException,)).until(settled)
+            ok = True
+        except TimeoutException:
+            ok = False
+        self._pause(started)
+        return ok
+
+    def wait_for_growth(self, before, container=None, selector=None):
+        """滚动后等待内容增长（高度变化或条目数增加），有变化立即返回
+        无变化时下一次的等待窗口翻倍（不超过max_window），有变化后恢复为min_window
+        :param before: 滚动前的snapshot
+        :return: (是否有变化, 最新snapshot)
+        """
+        started = time.time()
+        latest = {'state': before}
+
+        def grown(driver):
+            state = self.snapshot(container, selector)
+            latest['state'] = state
+            return state['height'] != before['height'] or state['items'] > before['items']
+
+        try:
+            WebDriverWait(self.driver, self.window, poll_frequency=self.poll,
+                          ignored_exceptions=(WebDriverException,)).until(grown)
+            changed = True
+            self.window = self.min_window
+        except TimeoutException:
+            changed = False
+            self.window = min(self.window * 2, self.max_window)
+        self._pause(started)
+        return changed, latest['state']
+
+    def wait_new_window(self, handles, timeout=10):
+        """等待新标签页打开
+        :param handles: 打开前的窗口句柄列表
+        :return: 是否打开了新标签页
+        """
+        try:
+            WebDriverWait(self.driver, timeout, poll_frequency=self.poll).until(
+                EC.number_of_windows_to_be(len(handles) + 1))
+            return True
+        except TimeoutException:
+            return False
+
+    def reset(self):
+        """开始新的滚动加载前恢复最短等待窗口"""
+        self.window = self.min_window
@@ -0,0 +1,136 @@
+# -*- coding: utf-8 -*-
+"""
+评论并发爬取
+启动N个独立的浏览器会话（每个会话一个工作线程、各自限速），
+从队列中领取商品链接并爬取评论；结果按提交顺序（即商品顺序）交回主线程写入结果文件。
+"""
+
+import queue
+import random
+import threading
+import time
+from collections import deque
+
+
+class RateLimiter:
+    """限制同一会话相邻两次请求的间隔（随机取 min_gap~max_gap 秒），降低反爬风险"""
+
+    def __init__(self, min_gap=3, max_gap=6):
+        self.min_gap = min_gap
+        self.max_gap = max_gap
+        self._last = 0.0
+
+    def wait(self):
+        remaining = self._last + random.uniform(self.min_gap, self.max_gap) - time.time()
+        if remaining > 0:
+            time.sleep(remaining)
+        self._last = time.time()
+
+
+class ReviewWorkerPool:
+    """评论爬取工作池
+
+    用法:
+        pool = ReviewWorkerPool(create_session, crawl, close_session, workers=4)
+        pool.submit(payload, url, title, num)      # url为None时不爬评论，直接按顺序交回
+        for payload, reviews in pool.completed():  # 取出已按顺序完成的商品（爬取失败的商品reviews为None）
+            ...
+        pool.close()
+    """
+
+    def __init__(self, create_session, crawl, close_session, workers=4, min_gap=3, max_gap=6):
+        """
+        :param create_session: create_session(编号) -> 会话（如已登录的浏览器），在主线程中依次创建
+        :param crawl: crawl(会话, 商品链接, 商品标题, 商品序号) -> 评论列表
+        :param close_session: close_session(会话)，关闭会话
+        某个会话创建失败时，关闭已创建的会话后抛出异常
+        :param workers: 会话（线程）数量
+        :param min_gap / max_gap: 每个会话相邻两个商品之间的随机间隔范围（秒）
+        """
+        self._crawl = crawl
+        self._close_session = close_session
+        self._tasks = queue.Queue()
+        self._results = {}          # 提交序号 -> 评论列表（爬取失败为None）
+        self._pending = deque()     # 按提交顺序排列的 (提交序号, payload)
+        self._next_seq = 0
+        self._cond = threading.Condition()
+        self._sessions = []
+        try:
+            for i in range(workers):
+                self._sessions.append(create_session(i))
+        except Exception:
+            self._close_sessions()
+            raise
+        self._threads = []
+        for session in self._sessions:
+            thread = threading.Thread(target=self._worker, args=(session, RateLimiter(min_gap, max_gap)),
+                                      daemon=True)
+            thread.start()
+            self._threads.append(thread)
+
+    def _worker(self, session, limiter):
+        while True:
+            task = self._tasks.get()
+            if task is None:
+                break
+            seq, url, title, num = task
+            limiter.wait()
+            try:
+                reviews = self._crawl(session, url, title, num)
+            except Exception as exc:
+                print(f"  └─ 商品{num}评论爬取失败: {exc}")
+                reviews = None  # 失败标记：调用方不应把该商品记为已完成
+            with self._cond:
+                self._results[seq] = reviews
+                self._cond.notify_all()
+
+    def submit(self, payload, url=None, title=None, num=None):
+        """提交一个商品；url为None时不爬取评论，但仍按提交顺序交回"""
+        seq = self._next_seq
+        self._next_seq += 1
+        self._pending.append((seq, payload))
+        if url is None:
+            with self._cond:
+                self._results[seq] = []
+        else:
+            self._tasks.put((seq, url, title, num))
+
+    def completed(self, block=False):
+        """按提交顺序产出已完成的 (payload, 评论列表)，评论爬取失败的商品评论列表为None
+        :param block: 为False时遇到第一个未完成的商品即停止；为True时等待全部完成
+        """
+        while self._pending:
+            seq, payload = self._pending[0]
+            with self._cond:
+                if seq not in self._results:
+                    if not block:
+                        return
+                    self._cond.wait_for(lambda: seq in self._results)
+                reviews = self._results.pop(seq)
+            self._pending.popleft()
+            yield payload, reviews
+
+    def close(self, cancel=False):
+        """关闭工作池
+        :param cancel: 为True时丢弃尚未开始的任务（如程序被中断），不等待进行中的任务
+        """
+        if cancel:
+            while True:
+                try:
+                    self._tasks.get_nowait()
+                except queue.Empty:
+                    break
+        for _ in self._threads:
+            self._tasks.put(None)
+        if not cancel:
+            for thread in self._threads:
+                thread.join()
+        self._close_sessions()
+
+    def _close_sessions(self):
+        for session in self._sessions:
+            try:
+                self._close_session(session)
+            except Exception:
+                pass
+        self._sessions = []
@@ -0,0 +1,133 @@
+# -*- coding: utf-8 -*-
+"""
+评论增量提取
+滚动加载评论的过程中，每次滚动后只提取新追加的评论节点（第N条之后），
+由浏览器端JS直接返回结构化字段（用户名、内容、时间、购买记录、整块文本），
+不再在滚动结束后获取整个page_source并用pyquery解析：
+    - 解析开销与评论数线性相关，每条评论只处理一次
+    - Python端不保留整棵DOM树，内存峰值不随页面大小增长
+"""
+
+# 评论项的常见选择器（按优先级排序，第一个有匹配的选择器会被固定使用）
+REVIEW_SELECTORS = [
+    'div.Comment--H5QmJwe9',  # 新版淘宝评论项
+    'div[class*="Comment--"]',  # 模糊匹配评论项
+    'div.rate-grid',  # 旧版淘宝评论容器
+    'div.J_KgRate_ReviewItem',  # 天猫评论
+    'div.rate-item',  # 评论项
+    'div.commentItem',  # 通用评论项
+    'div[class*="comment"]',  # 模糊匹配包含comment的类
+]
+
+# 评论字段的选择器（每个字段按顺序取第一个非空的结果）
+FIELD_SELECTORS = {
+    'username': [
+        '.userNick--L1gNFN4c',  # 新版淘宝
+        '.header--nYbpA78v .username',
+        '.rate-user-info',
+        '.tb-rate-user',
+        '.user-name',
+        'div[class*="userNick"]',
+        'div[class*="username"]',
+        'span[class*="user"]'
+    ],
+    'content': [
+        '.content--wJnWgVVD',  # 新版淘宝
+        '.reviewDetail--BmRBV0Aq',
+        '.rate-content',
+        '.J_KgRate_ReviewContent',
+        '.comment-content',
+        'div[class*="content"]',
+        'div[class*="reviewDetail"]'
+    ],
+    'time': [
+        '.date--kEq7WUd3',  # 新版淘宝
+        '.time--xmsIQ6o3',  # 新版淘宝时间
+        '.rate-date',
+        '.tm-rate-date',
+        '.comment-time',
+        'span[class*="date"]',
+        'span[class*="time"]',
+        'div[class*="date"]',
+        'div[class*="time"]',
+        '.header--nYbpA78v span:last-child',  # 头部最后一个span可能是时间
+    ],
+    'purchase': [
+        '.meta--PLijz6qf',  # ✅ 新版淘宝购买记录（包含时间+规格）- 最优先！
+        '.attribute--wPXM_ggZ',  # 新版淘宝
+        '.subInfo--Y53eXpAX',  # 新版淘宝子信息
+        '.text--YbMC04EH',  # 规格文本
+        'div[class*="meta--"]',  # 模糊匹配meta类
+        '.rate-sku',
+        '.sku-info',
+        '.tm-rate-sku',
+        '.rate-append-sku',
+        'div[class*="attribute"]',
+        'div[class*="sku"]',
+        'div[class*="subInfo"]',
+        'div[class*="text--"]',
+        'span[class*="sku"]',
+    ],
+}
+
+# 从第start个评论节点开始提取结构化字段
+# 字段取值与 pyquery 的 item.find(selector).text() 一致：同一选择器的多个匹配用空格连接
+_HARVEST_JS = """
+var selectors = arguments[0], start = arguments[1], fieldSelectors = arguments[2], wantHtml = arguments[3];
+var selector = null, nodes = [];
+for (var i = 0; i < selectors.length; i++) {
+    nodes = document.querySelectorAll(selectors[i]);
+    if (nodes.length) { selector = selectors[i]; break; }
+}
+function firstText(item, list) {
+    for (var i = 0; i < list.length; i++) {
+        var found = item.querySelectorAll(list[i]), parts = [];
+        for (var j = 0; j < found.length; j++) {
+            var text = (found[j].innerText || '').trim();
+            if (text) { parts.push(text); }
+        }
+        if (parts.length) { return parts.join(' '); }
+    }
+    return '';
+}
+var records = [];
+for (var k = start; k < nodes.length; k++) {
+    var item = nodes[k], record = {text: (item.innerText || '').trim()};
+    for (var name in fieldSelectors) { record[name] = firstText(item, fieldSelectors[name]); }
+    if (wantHtml && !record.purchase) { record.html = item.outerHTML; }
+    records.push(record);
+}
+return {selector: selector, total: nodes.length, records: records};
+"""
+
+
+class ReviewHarvester:
+    """逐批提取新加载的评论节点"""
+
+    def __init__(self, driver, review_selectors=REVIEW_SELECTORS, field_selectors=FIELD_SELECTORS):
+        self.driver = driver
+        self.review_selectors = list(review_selectors)
+        self.field_selectors = field_selectors
+        self.selector = None      # 第一次找到评论后固定使用的选择器
+        self.next_index = 0       # 下一次从第几个评论节点开始提取
+        self.total = 0            # 页面上当前的评论节点数
+
+    def harvest(self, want_html=False):
+        """返回上次提取之后新出现的评论记录列表
+        :param want_html: 为True时，未找到购买记录的评论额外返回节点HTML（用于调试样本）
+        :return: [{'text', 'username', 'content', 'time', 'purchase'[, 'html']}, ...]
+        """
+        selectors = [self.selector] if self.selector else self.review_selectors
+        result = self.driver.execute_script(_HARVEST_JS, selectors, self.next_index,
+                                            self.field_selectors, want_html)
+        if result['selector'] and not self.selector:
+            self.selector = result['selector']
+            print(f"    ↳ 使用选择器 '{self.selector}' 提取评论")
+        self.total = result['total']
+        # 评论列表被页面重新渲染（节点变少）时从头提取，重复的评论由调用方去重
+        if self.total < self.next_index:
+            self.next_index = 0
+            return self.harvest(want_html)
+        records = result['records']
+        self.next_index += len(records)
+        return records